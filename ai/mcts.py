@@ -0,0 +1,376 @@
+"""
+Monte Carlo tree search agent
+Plans every tick by restoring a snapshot of the arena into a private
+Simulation and running short simulated rollouts until the tick's time
+budget is used up, then plays the most visited first action. Needs no
+training, so it doubles as a baseline opponent/companion and as a
+throughput test for the simulator.
+
+Tree edges are macro actions (one ACTIONS entry held for `repeat` ticks);
+rollouts continue with random macro actions up to `horizon` ticks and are
+scored with the same rewards as ArenaEnv. In parallel mode every worker
+process searches its own tree from the same snapshot (root
+parallelization) and the root visit counts are summed.
+
+Run `python -m ai.mcts` to measure rollouts/second on your machine.
+"""
+
+import math
+import multiprocessing as mp
+import time
+import traceback
+import numpy as np
+from config import *
+from game.simulation import Simulation
+from game.snapshot import SimulationSnapshot
+from ai.environment import (ACTIONS, REWARD_DAMAGE_DEALT, REWARD_DAMAGE_TAKEN,
+                            REWARD_KILL, REWARD_WAVE_CLEAR, REWARD_DEATH)
+
+
+class _Node:
+    """Search tree node (the state after its path of macro actions)"""
+
+    __slots__ = ('visits', 'value', 'children', 'terminal')
+
+    def __init__(self, terminal=False):
+        self.visits = 0
+        self.value = 0.0  # Sum of returns through this node
+        self.children = {}  # Action index -> _Node
+        self.terminal = terminal
+
+
+class TreeSearch:
+    """One search tree over a private Simulation"""
+
+    def __init__(self, race='human', character_class='warrior', repeat=6, horizon=48,
+                 exploration=1.0, distance_weight=1.0, seed=None, dt=SIM_DT):
+        """
+        Initialize search
+
+        Args:
+            race: Player race (must match the searched game)
+            character_class: Player class (must match the searched game)
+            repeat: Ticks each tree action is held for
+            horizon: Ticks simulated per rollout (tree path + random tail)
+            exploration: UCB exploration constant
+            distance_weight: Value lost per arena width to the nearest
+                enemy at the end of a rollout (pulls the search toward
+                fights beyond the horizon)
+            seed: Seed for action sampling
+            dt: Timestep of the searched game
+        """
+        self.sim = Simulation(race=race, character_class=character_class, dt=dt)
+        self.sim.reset()
+        self.repeat = repeat
+        self.horizon = horizon
+        self.exploration = exploration
+        self.distance_weight = distance_weight
+        self.rng = np.random.default_rng(seed)
+
+    def search(self, snapshot, budget):
+        """
+        Run rollouts from a snapshot until the time budget is used up
+
+        At least one rollout is always run.
+
+        Args:
+            snapshot: SimulationSnapshot of the state to plan from
+            budget: Seconds to search
+
+        Returns:
+            tuple: (visits, value sums) per ACTIONS entry, rollouts run
+        """
+        deadline = time.perf_counter() + budget
+        root = _Node()
+        rollouts = 0
+
+        while True:
+            self.sim.restore(snapshot)
+            self._rollout(root)
+            rollouts += 1
+            if time.perf_counter() >= deadline:
+                break
+
+        visits = np.zeros(len(ACTIONS))
+        values = np.zeros(len(ACTIONS))
+        for action, child in root.children.items():
+            visits[action] = child.visits
+            values[action] = child.value
+        return visits, values, rollouts
+
+    def _rollout(self, root):
+        """Select and expand one path from the root, finish it randomly, back up the return"""
+        node = root
+        path = [root]
+        total = 0.0
+        ticks = 0
+        done = False
+
+        # Selection / expansion
+        while not done and ticks < self.horizon:
+            if len(node.children) < len(ACTIONS):
+                action = self._untried(node)
+                reward, done = self._advance(action)
+                child = _Node(done)
+                node.children[action] = child
+                node = child
+                path.append(node)
+                total += reward
+                ticks += self.repeat
+                break
+            action, node = self._select(node)
+            reward, done = self._advance(action)
+            path.append(node)
+            total += reward
+            ticks += self.repeat
+            done = done or node.terminal
+
+        # Random tail
+        while not done and ticks < self.horizon:
+            reward, done = self._advance(int(self.rng.integers(len(ACTIONS))))
+            total += reward
+            ticks += self.repeat
+
+        if not done:
+            total += self._evaluate()
+
+        for node in path:
+            node.visits += 1
+            node.value += total
+
+    def _evaluate(self):
+        """Heuristic value of an unfinished rollout: closer to the nearest enemy is better"""
+        sim = self.sim
+        pool = sim.enemies
+        indices = pool.indices()
+        if len(indices) == 0:
+            return 0.0
+        dx = pool.x[indices] - sim.player.x
+        dy = pool.y[indices] - sim.player.y
+        nearest = math.sqrt(float((dx * dx + dy * dy).min()))
+        return -self.distance_weight * nearest / ARENA_WIDTH
+
+    def _untried(self, node):
+        """Random action that has no child yet"""
+        untried = [action for action in range(len(ACTIONS)) if action not in node.children]
+        return untried[int(self.rng.integers(len(untried)))]
+
+    def _select(self, node):
+        """Child with the highest UCB score"""
+        log_visits = math.log(node.visits)
+        best = None
+        best_score = -math.inf
+        for action, child in node.children.items():
+            score = (child.value / child.visits
+                     + self.exploration * math.sqrt(log_visits / child.visits))
+            if score > best_score:
+                best = action, child
+                best_score = score
+        return best
+
+    def _advance(self, action):
+        """
+        Hold one action for `repeat` ticks
+
+        Returns:
+            tuple: (reward, episode over)
+        """
+        sim = self.sim
+        action = ACTIONS[action]
+        reward = 0.0
+
+        for _ in range(self.repeat):
+            sim.step(action)
+            reward += (sim.damage_dealt * REWARD_DAMAGE_DEALT
+                       + sim.damage_taken * REWARD_DAMAGE_TAKEN
+                       + sim.kills * REWARD_KILL)
+
+            # Move straight on to the next wave/floor, like ArenaEnv
+            if sim.state == 'wave_complete':
+                reward += REWARD_WAVE_CLEAR
+                sim.next_wave()
+            elif sim.state == 'floor_complete':
+                reward += REWARD_WAVE_CLEAR
+                sim.next_floor()
+
+            if sim.state == 'game_over':
+                return reward + REWARD_DEATH, True
+            if sim.state == 'victory':
+                return reward, True
+
+        return reward, False
+
+
+def _worker(pipe, search_kwargs):
+    """
+    Worker loop: search snapshots on command
+
+    Args:
+        pipe: Connection to the parent process
+        search_kwargs: Keyword arguments for TreeSearch
+    """
+    try:
+        tree = TreeSearch(**search_kwargs)
+        while True:
+            command, data = pipe.recv()
+
+            if command == 'search':
+                snapshot, budget = data
+                pipe.send(('ok', tree.search(snapshot, budget)))
+
+            elif command == 'close':
+                break
+    except Exception:
+        pipe.send(('error', traceback.format_exc()))
+    finally:
+        pipe.close()
+
+
+class MCTSAgent:
+    """Picks each tick's Action by tree search over simulated rollouts"""
+
+    def __init__(self, race='human', character_class='warrior', time_budget=0.008,
+                 num_workers=0, repeat=6, horizon=48, exploration=1.0,
+                 distance_weight=1.0, seed=None, context=None, dt=SIM_DT):
+        """
+        Initialize agent (and worker processes in parallel mode)
+
+        Args:
+            race: Player race of the games it will play
+            character_class: Player class of the games it will play
+            time_budget: Seconds of search per tick
+            num_workers: Extra worker processes searching alongside this
+                one (0 searches in this process only)
+            repeat: Ticks each tree action is held for
+            horizon: Ticks simulated per rollout
+            exploration: UCB exploration constant
+            distance_weight: Rollout penalty per arena width to the nearest enemy
+            seed: Seed for action sampling (None for fresh entropy)
+            context: multiprocessing start method (default: platform default)
+            dt: Timestep of the games it will play
+        """
+        self.time_budget = time_budget
+        seeds = np.random.SeedSequence(seed).spawn(num_workers + 1)
+        search_kwargs = {
+            'race': race, 'character_class': character_class, 'repeat': repeat,
+            'horizon': horizon, 'exploration': exploration,
+            'distance_weight': distance_weight, 'dt': dt,
+        }
+        self.tree = TreeSearch(seed=seeds[0], **search_kwargs)
+        self.snapshot = SimulationSnapshot()
+
+        # Stats
+        self.rollouts = 0
+        self.search_time = 0.0
+        self.last_rollouts = 0  # Rollouts behind the most recent action
+
+        # Parallel workers
+        ctx = mp.get_context(context)
+        self._pipes = []
+        self._processes = []
+        for worker_seed in seeds[1:]:
+            parent, child = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker,
+                args=(child, dict(search_kwargs, seed=worker_seed)),
+                daemon=True
+            )
+            process.start()
+            child.close()
+            self._pipes.append(parent)
+            self._processes.append(process)
+
+    @property
+    def rollouts_per_second(self):
+        """Rollouts per second of search so far"""
+        return self.rollouts / self.search_time if self.search_time > 0 else 0.0
+
+    def act(self, sim):
+        """
+        Plan from the simulation's current state
+
+        The simulation itself is only read; rollouts run on private copies.
+
+        Args:
+            sim: Simulation to pick an action for
+
+        Returns:
+            Action: Action for the next tick
+        """
+        start = time.perf_counter()
+        snapshot = sim.snapshot(self.snapshot)
+
+        for pipe in self._pipes:
+            pipe.send(('search', (snapshot, self.time_budget)))
+        visits, values, rollouts = self.tree.search(snapshot, self.time_budget)
+        for pipe in self._pipes:
+            status, data = pipe.recv()
+            if status == 'error':
+                raise RuntimeError(f"MCTS worker failed:\n{data}")
+            visits += data[0]
+            values += data[1]
+            rollouts += data[2]
+
+        # Most visited, ties broken by mean return
+        mean = values / np.maximum(visits, 1)
+        best = max(range(len(ACTIONS)), key=lambda action: (visits[action], mean[action]))
+
+        self.last_rollouts = rollouts
+        self.rollouts += rollouts
+        self.search_time += time.perf_counter() - start
+        return ACTIONS[best]
+
+    def close(self):
+        """Stop worker processes"""
+        for pipe in self._pipes:
+            try:
+                pipe.send(('close', None))
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for pipe in self._pipes:
+            pipe.close()
+        self._pipes = []
+        self._processes = []
+
+
+def play(agent, seed=0, max_ticks=3600, race='human', character_class='warrior'):
+    """
+    Let an agent play a headless game
+
+    Args:
+        agent: MCTSAgent to play
+        seed: Episode seed
+        max_ticks: Ticks before stopping
+        race: Player race (must match the agent's)
+        character_class: Player class (must match the agent's)
+
+    Returns:
+        Simulation: Final state
+    """
+    sim = Simulation(race=race, character_class=character_class)
+    sim.reset(seed=seed)
+    while sim.tick_count < max_ticks:
+        sim.step(agent.act(sim))
+        if sim.state == 'wave_complete':
+            sim.next_wave()
+        elif sim.state == 'floor_complete':
+            sim.next_floor()
+        elif sim.state != 'playing':
+            break
+    return sim
+
+
+if __name__ == "__main__":
+    for workers in (0, 2):
+        agent = MCTSAgent(num_workers=workers, seed=0)
+        try:
+            sim = play(agent, max_ticks=600)
+        finally:
+            agent.close()
+        print(f"MCTS ({workers} workers): {agent.rollouts_per_second:,.0f} rollouts/s, "
+              f"{sim.state} on floor {sim.current_floor} wave {sim.current_wave}, "
+              f"HP {int(sim.player.hp)}/{sim.player.max_hp}")
@@ -0,0 +1,214 @@
+"""
+Multi-process vector environment with shared-memory buffers
+Each worker process steps a contiguous batch of ArenaEnv arenas and writes
+observations, rewards and done flags straight into shared memory.
+
+Only a tiny command message crosses the pipe per worker per step; the
+batched arrays are never pickled. Final observations of finished episodes
+(needed for auto-reset bookkeeping) are the only payload sent back.
+"""
+
+import multiprocessing as mp
+import os
+import traceback
+from multiprocessing import shared_memory
+import numpy as np
+from gymnasium.vector import VectorEnv
+from ai.environment import ArenaEnv
+
+
+def _as_arrays(blocks, num_envs, obs_size):
+    """Map the shared blocks (obs, rewards, terminated, truncated, actions) as NumPy arrays"""
+    return (
+        np.ndarray((num_envs, obs_size), dtype=np.float32, buffer=blocks[0].buf),
+        np.ndarray(num_envs, dtype=np.float64, buffer=blocks[1].buf),
+        np.ndarray(num_envs, dtype=bool, buffer=blocks[2].buf),
+        np.ndarray(num_envs, dtype=bool, buffer=blocks[3].buf),
+        np.ndarray(num_envs, dtype=np.int64, buffer=blocks[4].buf),
+    )
+
+
+def _worker(pipe, names, num_envs, obs_size, start, stop, env_kwargs):
+    """
+    Worker loop: step arenas [start, stop) on command
+
+    Args:
+        pipe: Connection to the parent process
+        names: Shared memory block names (obs, rewards, terminated, truncated, actions)
+        num_envs: Total arenas across all workers
+        obs_size: Length of one observation
+        start: First arena index owned by this worker
+        stop: One past the last arena index owned by this worker
+        env_kwargs: Keyword arguments for ArenaEnv
+    """
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    obs, rewards, terminated, truncated, actions = _as_arrays(blocks, num_envs, obs_size)
+    envs = [ArenaEnv(**env_kwargs) for _ in range(start, stop)]
+
+    try:
+        while True:
+            command, data = pipe.recv()
+
+            if command == 'step':
+                finals = []
+                for i, env in enumerate(envs, start):
+                    ob, rewards[i], terminated[i], truncated[i], info = env.step(actions[i])
+                    if terminated[i] or truncated[i]:
+                        finals.append((i, ob.copy(), dict(info)))
+                        ob, _ = env.reset()
+                    obs[i] = ob
+                pipe.send(('ok', finals))
+
+            elif command == 'reset':
+                for i, env in enumerate(envs, start):
+                    seed = None if data is None else data + i
+                    obs[i], _ = env.reset(seed=seed)
+                pipe.send(('ok', None))
+
+            elif command == 'close':
+                break
+    except Exception:
+        pipe.send(('error', traceback.format_exc()))
+    finally:
+        del obs, rewards, terminated, truncated, actions
+        for block in blocks:
+            block.close()
+        pipe.close()
+
+
+class SharedMemoryVectorEnv(VectorEnv):
+    """ArenaEnv arenas spread over worker processes, batched through shared memory"""
+
+    metadata = {'render_modes': [], 'autoreset': True}
+
+    def __init__(self, num_envs, num_workers=None, env_kwargs=None, copy=True, context=None):
+        """
+        Initialize vector environment and start workers
+
+        Args:
+            num_envs: Total number of arenas
+            num_workers: Worker processes (default: one per CPU core)
+            env_kwargs: Keyword arguments for each ArenaEnv
+            copy: Return copies of the shared arrays (False returns views that the next step overwrites)
+            context: multiprocessing start method (default: platform default)
+        """
+        env_kwargs = env_kwargs or {}
+        template = ArenaEnv(**env_kwargs)
+        super().__init__(num_envs, template.observation_space, template.action_space)
+
+        self.copy = copy
+        obs_size = template.observation_space.shape[0]
+        num_workers = min(num_workers or os.cpu_count() or 1, num_envs)
+
+        # Shared buffers
+        sizes = [
+            num_envs * obs_size * np.dtype(np.float32).itemsize,
+            num_envs * np.dtype(np.float64).itemsize,
+            num_envs,
+            num_envs,
+            num_envs * np.dtype(np.int64).itemsize,
+        ]
+        self._blocks = [shared_memory.SharedMemory(create=True, size=size) for size in sizes]
+        names = [block.name for block in self._blocks]
+        self._obs, self._rewards, self._terminated, self._truncated, self._actions = \
+            _as_arrays(self._blocks, num_envs, obs_size)
+
+        # Workers own contiguous slices of arenas
+        ctx = mp.get_context(context)
+        bounds = np.linspace(0, num_envs, num_workers + 1).astype(int)
+        self._pipes = []
+        self._processes = []
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            parent, child = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker,
+                args=(child, names, num_envs, obs_size, int(start), int(stop), env_kwargs),
+                daemon=True
+            )
+            process.start()
+            child.close()
+            self._pipes.append(parent)
+            self._processes.append(process)
+
+    def reset_async(self, seed=None, options=None):
+        """Ask every worker to reset its arenas"""
+        if isinstance(seed, (list, tuple)):
+            seed = seed[0]
+        for pipe in self._pipes:
+            pipe.send(('reset', seed))
+
+    def reset_wait(self, seed=None, options=None):
+        """Wait for the reset and return the batched observations"""
+        self._collect()
+        return self._output(self._obs), {}
+
+    def step_async(self, actions):
+        """Write actions into shared memory and start every worker"""
+        self._actions[:] = actions
+        for pipe in self._pipes:
+            pipe.send(('step', None))
+
+    def step_wait(self):
+        """
+        Wait for every worker to finish the step
+
+        Returns:
+            tuple: (observations, rewards, terminated, truncated, info)
+        """
+        finals = self._collect()
+        info = {}
+
+        if finals:
+            done = np.zeros(self.num_envs, dtype=bool)
+            final_obs = np.empty(self.num_envs, dtype=object)
+            final_info = np.empty(self.num_envs, dtype=object)
+            for i, ob, env_info in finals:
+                done[i] = True
+                final_obs[i] = ob
+                final_info[i] = env_info
+            info['final_observation'] = final_obs
+            info['_final_observation'] = done
+            info['final_info'] = final_info
+            info['_final_info'] = done.copy()
+
+        return (
+            self._output(self._obs),
+            self._output(self._rewards),
+            self._output(self._terminated),
+            self._output(self._truncated),
+            info
+        )
+
+    def close_extras(self, **kwargs):
+        """Stop workers and free the shared memory"""
+        for pipe in self._pipes:
+            try:
+                pipe.send(('close', None))
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for pipe in self._pipes:
+            pipe.close()
+
+        del self._obs, self._rewards, self._terminated, self._truncated, self._actions
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+
+    def _collect(self):
+        """Gather replies from every worker, raising on worker errors"""
+        finals = []
+        for pipe in self._pipes:
+            status, data = pipe.recv()
+            if status == 'error':
+                raise RuntimeError(f"Arena worker failed:\n{data}")
+            if data:
+                finals.extend(data)
+        return finals
+
+    def _output(self, array):
+        """Copy a shared array unless views were requested"""
+        return array.copy() if self.copy else array
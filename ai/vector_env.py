@@ -0,0 +1,400 @@
+"""
+Batched NumPy vector environment
+Simulates N arenas in lockstep with one vectorized update per tick.
+
+Positions, HP, cooldowns and spawn queues for every arena and enemy live in
+(num_envs,) and (num_envs, max_enemies) arrays, so a tick costs a fixed
+number of NumPy operations no matter how many arenas or enemies there are.
+The rules mirror game.simulation.Simulation (Enemy.update melee/ranged AI,
+Player.take_damage defense, wave and floor progression) for the arena room,
+whose only walls are the boundary walls.
+"""
+
+import numpy as np
+from gymnasium import spaces
+from gymnasium.vector import VectorEnv
+from config import *
+from game.player import Player
+from game.dungeon import Room
+from ai.environment import (
+    ACTIONS, PLAYER_FEATURES, ENEMY_FEATURES, MAX_OBSERVED_ENEMIES, OBS_SIZE,
+    REWARD_DAMAGE_DEALT, REWARD_DAMAGE_TAKEN, REWARD_KILL, REWARD_WAVE_CLEAR, REWARD_DEATH
+)
+
+# Action table as arrays
+ACTION_MOVE_X = np.array([action.move_x for action in ACTIONS], dtype=np.float64)
+ACTION_MOVE_Y = np.array([action.move_y for action in ACTIONS], dtype=np.float64)
+ACTION_ATTACK = np.array([action.attack for action in ACTIONS], dtype=bool)
+ACTION_POTION = np.array([action.use_potion for action in ACTIONS], dtype=bool)
+
+# Enemy stat tables indexed by type id
+WAVE_ENEMY_TYPES = ['goblin', 'skeleton', 'goblin_archer', 'slime']
+TYPE_HP = np.array([ENEMIES[t]['hp'] for t in WAVE_ENEMY_TYPES], dtype=np.float64)
+TYPE_DAMAGE = np.array([ENEMIES[t]['damage'] for t in WAVE_ENEMY_TYPES], dtype=np.float64)
+TYPE_SPEED = np.array([ENEMIES[t]['speed'] for t in WAVE_ENEMY_TYPES], dtype=np.float64)
+TYPE_RANGED = np.array([ENEMIES[t]['attack_type'] == 'ranged' for t in WAVE_ENEMY_TYPES])
+
+MAX_POTIONS = 2 + FLOORS // 2
+
+
+class BatchedArenaEnv(VectorEnv):
+    """N arenas stepped together as a Gymnasium VectorEnv with auto-reset"""
+
+    metadata = {'render_modes': [], 'autoreset': True}
+
+    def __init__(self, num_envs=256, race='human', character_class='warrior',
+                 max_episode_steps=10000, max_enemies=16, dt=SIM_DT):
+        """
+        Initialize vector environment
+
+        Args:
+            num_envs: Number of arenas
+            race: Player race (same for every arena)
+            character_class: Player class (same for every arena)
+            max_episode_steps: Ticks before an arena is truncated
+            max_enemies: Enemy slots per arena (largest wave is 3 + FLOORS + WAVES_PER_FLOOR - 1)
+            dt: Fixed timestep in seconds
+        """
+        super().__init__(
+            num_envs,
+            spaces.Box(-1.0, 1.0, shape=(OBS_SIZE,), dtype=np.float32),
+            spaces.Discrete(len(ACTIONS))
+        )
+        self.max_episode_steps = max_episode_steps
+        self.max_enemies = max_enemies
+        self.dt = dt
+        self._rng = np.random.default_rng()
+
+        # Player stats are fixed by race/class
+        template = Player(0, 0, race=race, character_class=character_class)
+        self.player_max_hp = template.max_hp
+        self.player_defense = template.defense
+        self.player_damage = template.damage
+        self.player_attack_range = RANGED_RANGE if template.weapon_type == 'ranged' else MELEE_RANGE
+        self.player_size = template.width
+        self.enemy_size = SPRITE_SIZE
+
+        # Arena room, compiled once for batched collision lookups
+        self.room = Room(ARENA_WIDTH, ARENA_HEIGHT, ARENA_X, ARENA_Y)
+        self.room.compile_walls()
+
+        n = num_envs
+        m = max_enemies
+
+        # Player state
+        self.px = np.zeros(n)
+        self.py = np.zeros(n)
+        self.php = np.zeros(n)
+        self.pcooldown = np.zeros(n)
+        self.ppotions = np.zeros(n, dtype=np.int32)
+
+        # Enemy state
+        self.ex = np.zeros((n, m))
+        self.ey = np.zeros((n, m))
+        self.ehp = np.zeros((n, m))
+        self.emax_hp = np.ones((n, m))
+        self.edamage = np.zeros((n, m))
+        self.espeed = np.zeros((n, m))
+        self.ecooldown = np.zeros((n, m))
+        self.eranged = np.zeros((n, m), dtype=bool)
+        self.ealive = np.zeros((n, m), dtype=bool)
+
+        # Potions
+        self.ix = np.zeros((n, MAX_POTIONS))
+        self.iy = np.zeros((n, MAX_POTIONS))
+        self.iactive = np.zeros((n, MAX_POTIONS), dtype=bool)
+
+        # Progress and spawn queue
+        self.floor = np.ones(n, dtype=np.int32)
+        self.wave = np.ones(n, dtype=np.int32)
+        self.spawn_timer = np.zeros(n)
+        self.spawn_count = np.zeros(n, dtype=np.int32)
+        self.spawned = np.zeros(n, dtype=np.int32)
+        self.time_survived = np.zeros(n)
+        self.steps = np.zeros(n, dtype=np.int32)
+        self.kills = np.zeros(n, dtype=np.int32)
+
+        # Output buffers
+        self._obs = np.zeros((n, OBS_SIZE), dtype=np.float32)
+        self._rewards = np.zeros(n)
+        self._terminated = np.zeros(n, dtype=bool)
+        self._truncated = np.zeros(n, dtype=bool)
+        self._actions = np.zeros(n, dtype=np.int64)
+        self._arange = np.arange(n)
+
+    def reset_wait(self, seed=None, options=None):
+        """Reset every arena"""
+        if seed is not None:
+            self._rng = np.random.default_rng(seed)
+        self._reset_arenas(np.ones(self.num_envs, dtype=bool))
+        return self._observe().copy(), {}
+
+    def step_async(self, actions):
+        """Store the batch of action indices for step_wait"""
+        self._actions[:] = actions
+
+    def step_wait(self):
+        """
+        Advance every arena one tick, auto-resetting finished arenas
+
+        Returns:
+            tuple: (observations, rewards, terminated, truncated, info)
+        """
+        actions = self._actions
+        dt = self.dt
+        m = self.max_enemies
+
+        # Potion (before anything else, like a key press handled before update)
+        drink = ACTION_POTION[actions] & (self.ppotions > 0) & (self.php < self.player_max_hp)
+        self.php[drink] = np.minimum(self.php[drink] + HEALTH_POTION_HEAL, self.player_max_hp)
+        self.ppotions[drink] -= 1
+        hp_start = self.php.copy()
+
+        self.time_survived += dt
+        self.steps += 1
+
+        # Wave spawner
+        self.spawn_timer += dt
+        self._spawn_due()
+        # WaveSpawner.update ends the wave once everything spawned is gone, so
+        # a wave whose last enemy dies this tick clears on the next one
+        wave_over = (self.spawned >= self.spawn_count) & ~self.ealive.any(axis=1)
+
+        # Player movement with arena bounds (speeds are pixels per tick at FPS)
+        px = self.px
+        py = self.py
+        step = PLAYER_SPEED * (dt * FPS)
+        px += ACTION_MOVE_X[actions] * step
+        py += ACTION_MOVE_Y[actions] * step
+        size = self.player_size
+        np.copyto(px, ARENA_X, where=np.trunc(px) < ARENA_X)
+        np.copyto(px, ARENA_X + ARENA_WIDTH - size, where=np.trunc(px) + size > ARENA_X + ARENA_WIDTH)
+        np.copyto(py, ARENA_Y, where=np.trunc(py) < ARENA_Y)
+        np.copyto(py, ARENA_Y + ARENA_HEIGHT - size, where=np.trunc(py) + size > ARENA_Y + ARENA_HEIGHT)
+
+        cooling = self.pcooldown > 0
+        self.pcooldown[cooling] -= dt
+
+        # Player attack
+        alive = self.ealive
+        dx = px[:, None] - self.ex
+        dy = py[:, None] - self.ey
+        distance = np.sqrt(dx * dx + dy * dy)
+        attacking = ACTION_ATTACK[actions] & (self.pcooldown <= 0)
+        self.pcooldown[attacking] = ATTACK_COOLDOWN
+        hit = attacking[:, None] & alive & (distance <= self.player_attack_range)
+        hp_before = self.ehp.copy()
+        self.ehp[hit] -= self.player_damage
+        np.maximum(self.ehp, 0, out=self.ehp)
+        damage_dealt = (hp_before - self.ehp).sum(axis=1)
+        updating = alive & (self.ehp > 0)
+
+        # Enemy AI (Enemy.update)
+        cooling = updating & (self.ecooldown > 0)
+        self.ecooldown[cooling] -= dt
+        ranged = self.eranged
+        melee = ~ranged
+        ready = self.ecooldown <= 0
+
+        melee_attack = updating & melee & (distance < 50)
+        ranged_retreat = updating & ranged & (distance < 100)
+        ranged_attack = updating & ranged & ~ranged_retreat & (distance < 250)
+        chase = updating & ~melee_attack & ~ranged_retreat & ~ranged_attack
+
+        strike = (melee_attack | ranged_attack) & ready
+        damage = self._strike(strike)
+
+        moving = chase | ranged_retreat
+        speed = self.espeed * (dt * FPS)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step_x = np.where(chase, dx, -dx) / distance * speed
+            step_y = np.where(chase, dy, -dy) / distance * speed
+        moving &= distance > 0
+        new_x = np.where(moving, self.ex + step_x, self.ex)
+        new_y = np.where(moving, self.ey + step_y, self.ey)
+        blocked = moving & self._hits_walls(new_x, new_y)
+        np.copyto(self.ex, new_x, where=moving & ~blocked)
+        np.copyto(self.ey, new_y, where=moving & ~blocked)
+
+        # Ready enemies in range attack after moving (Enemy.attack in the game loop)
+        dx = px[:, None] - self.ex
+        dy = py[:, None] - self.ey
+        distance = np.sqrt(dx * dx + dy * dy)
+        reach = np.where(ranged, 250, 50)
+        strike = alive & (self.ecooldown <= 0) & (distance <= reach)
+        damage += self._strike(strike)
+
+        # Player.take_damage
+        self.php -= damage
+        np.maximum(self.php, 0, out=self.php)
+
+        # Remove dead enemies
+        died = alive & (self.ehp <= 0)
+        kills = died.sum(axis=1)
+        alive &= ~died
+        self.kills += kills
+
+        # Potion pickups
+        dx = px[:, None] - self.ix
+        dy = py[:, None] - self.iy
+        picked = self.iactive & (np.sqrt(dx * dx + dy * dy) < 30)
+        self.iactive &= ~picked
+        self.ppotions += picked.sum(axis=1)
+
+        # Rewards
+        rewards = self._rewards
+        rewards[:] = (damage_dealt * REWARD_DAMAGE_DEALT
+                      + (hp_start - self.php) * REWARD_DAMAGE_TAKEN
+                      + kills * REWARD_KILL)
+
+        # Wave progression
+        cleared = wave_over & (self.php > 0)
+        rewards[cleared] += REWARD_WAVE_CLEAR
+        victory = self._advance_waves(cleared)
+
+        dead = self.php <= 0
+        rewards[dead] += REWARD_DEATH
+        terminated = self._terminated
+        truncated = self._truncated
+        terminated[:] = dead | victory
+        truncated[:] = ~terminated & (self.steps >= self.max_episode_steps)
+
+        obs = self._observe()
+        info = {}
+        done = terminated | truncated
+        if done.any():
+            final_obs = np.empty(self.num_envs, dtype=object)
+            final_info = np.empty(self.num_envs, dtype=object)
+            for i in np.flatnonzero(done):
+                final_obs[i] = obs[i].copy()
+                final_info[i] = {
+                    'floor': int(self.floor[i]),
+                    'wave': int(self.wave[i]),
+                    'kills': int(self.kills[i]),
+                    'time_survived': float(self.time_survived[i])
+                }
+            info['final_observation'] = final_obs
+            info['_final_observation'] = done.copy()
+            info['final_info'] = final_info
+            info['_final_info'] = done.copy()
+            self._reset_arenas(done)
+            obs = self._observe()
+
+        return obs.copy(), rewards.copy(), terminated.copy(), truncated.copy(), info
+
+    def _strike(self, strike):
+        """Apply enemy attacks and return raw damage per arena after defense"""
+        self.ecooldown[strike] = 1.0
+        hits = np.where(strike, np.maximum(1, self.edamage - self.player_defense), 0)
+        return hits.sum(axis=1)
+
+    def _hits_walls(self, x, y):
+        """Room.check_collision for every enemy rect at (x, y)"""
+        return self.room.collides(x, y, self.enemy_size, self.enemy_size)
+
+    def _spawn_due(self):
+        """Spawn queued enemies whose spawn time has passed"""
+        while True:
+            due = (self.spawned < self.spawn_count) & (self.spawn_timer >= self.spawned * WAVE_SPAWN_INTERVAL)
+            free = ~self.ealive
+            due &= free.any(axis=1)
+            arenas = np.flatnonzero(due)
+            if len(arenas) == 0:
+                return
+
+            slots = free[arenas].argmax(axis=1)
+            types = self._rng.integers(0, len(WAVE_ENEMY_TYPES), size=len(arenas))
+            self.ex[arenas, slots] = ARENA_X + ENEMY_SPAWN_X
+            self.ey[arenas, slots] = self._rng.integers(
+                ARENA_Y + ENEMY_SPAWN_Y_MIN, ARENA_Y + ENEMY_SPAWN_Y_MAX + 1, size=len(arenas))
+            self.ehp[arenas, slots] = TYPE_HP[types]
+            self.emax_hp[arenas, slots] = TYPE_HP[types]
+            self.edamage[arenas, slots] = TYPE_DAMAGE[types]
+            self.espeed[arenas, slots] = TYPE_SPEED[types]
+            self.eranged[arenas, slots] = TYPE_RANGED[types]
+            self.ecooldown[arenas, slots] = 0
+            self.ealive[arenas, slots] = True
+            self.spawned[arenas] += 1
+
+    def _start_wave(self, mask):
+        """Queue the current wave's enemies for the masked arenas"""
+        self.spawn_count[mask] = 3 + self.floor[mask] + (self.wave[mask] - 1)
+        self.spawned[mask] = 0
+        self.spawn_timer[mask] = 0
+
+    def _start_floor(self, mask):
+        """Reset player position, enemies and potions for the masked arenas"""
+        self.px[mask] = ARENA_X + PLAYER_SPAWN_X
+        self.py[mask] = ARENA_Y + PLAYER_SPAWN_Y
+        self.ealive[mask] = False
+
+        count = len(np.flatnonzero(mask))
+        self.ix[mask] = ARENA_X + self._rng.integers(100, ARENA_WIDTH - 100 + 1, size=(count, MAX_POTIONS))
+        self.iy[mask] = ARENA_Y + self._rng.integers(100, ARENA_HEIGHT - 100 + 1, size=(count, MAX_POTIONS))
+        num_potions = 2 + self.floor[mask] // 2
+        self.iactive[mask] = np.arange(MAX_POTIONS) < num_potions[:, None]
+
+        self._start_wave(mask)
+
+    def _advance_waves(self, cleared):
+        """
+        Move cleared arenas on to their next wave or floor
+
+        Returns:
+            ndarray: Arenas that just cleared the final floor
+        """
+        next_wave = cleared & (self.wave < WAVES_PER_FLOOR)
+        self.wave[next_wave] += 1
+        self._start_wave(next_wave)
+
+        floor_done = cleared & ~next_wave
+        victory = floor_done & (self.floor >= FLOORS)
+        next_floor = floor_done & ~victory
+        self.floor[next_floor] += 1
+        self.wave[next_floor] = 1
+        self._start_floor(next_floor)
+        return victory
+
+    def _reset_arenas(self, mask):
+        """Start a fresh episode in the masked arenas"""
+        self.php[mask] = self.player_max_hp
+        self.pcooldown[mask] = 0
+        self.ppotions[mask] = 0
+        self.floor[mask] = 1
+        self.wave[mask] = 1
+        self.time_survived[mask] = 0
+        self.steps[mask] = 0
+        self.kills[mask] = 0
+        self._start_floor(mask)
+
+    def _observe(self):
+        """Write every arena's observation into the shared buffer"""
+        obs = self._obs
+        px = self.px
+        py = self.py
+
+        obs[:, 0] = (px - ARENA_X) / ARENA_WIDTH
+        obs[:, 1] = (py - ARENA_Y) / ARENA_HEIGHT
+        obs[:, 2] = self.php / self.player_max_hp
+        obs[:, 3] = np.maximum(self.pcooldown, 0) / ATTACK_COOLDOWN
+        obs[:, 4] = np.minimum(self.ppotions, 5) / 5
+        remaining = self.ealive.sum(axis=1) + self.spawn_count - self.spawned
+        obs[:, 5] = np.minimum(remaining, 20) / 20
+
+        # Nearest enemies first, empty slots last
+        dx = self.ex - px[:, None]
+        dy = self.ey - py[:, None]
+        d2 = np.where(self.ealive, dx * dx + dy * dy, np.inf)
+        k = min(MAX_OBSERVED_ENEMIES, self.max_enemies)
+        order = np.argsort(d2, axis=1)[:, :k]
+        rows = self._arange[:, None]
+        present = self.ealive[rows, order]
+
+        features = obs[:, PLAYER_FEATURES:PLAYER_FEATURES + k * ENEMY_FEATURES].reshape(-1, k, ENEMY_FEATURES)
+        features[:, :, 0] = np.where(present, dx[rows, order] / ARENA_WIDTH, 0)
+        features[:, :, 1] = np.where(present, dy[rows, order] / ARENA_HEIGHT, 0)
+        features[:, :, 2] = np.where(present, self.ehp[rows, order] / self.emax_hp[rows, order], 0)
+        features[:, :, 3] = present & self.eranged[rows, order]
+        obs[:, PLAYER_FEATURES:PLAYER_FEATURES + k * ENEMY_FEATURES] = features.reshape(self.num_envs, -1)
+
+        return obs
@@ -0,0 +1,4 @@
+"""
+Headless performance benchmarks
+Fixed-seed scenarios timed tick by tick; run `python -m benchmarks --help`.
+"""
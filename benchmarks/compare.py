@@ -0,0 +1,194 @@
+"""
+Benchmark regression check
+Compares the stored runs of two commits on this machine. For every scenario
+workload (seed, ticks, entity count) both commits ran, and every metric, it
+reports the relative change in the mean with a bootstrap
+confidence interval (each commit's runs resampled with replacement). A
+change is significant when the interval excludes zero; it is flagged as a
+regression when it is significant, in the bad direction and larger than
+the threshold.
+
+    python -m benchmarks --repeat 5 --save        # on each commit
+    python -m benchmarks.compare BASE [HEAD]
+
+Refs are anything git understands; append '+' to pick the runs made with
+uncommitted changes on top of a commit (HEAD defaults to the current work
+tree). Exits with status 1 when a regression is found.
+"""
+
+import argparse
+import sys
+import numpy as np
+from benchmarks.history import (DEFAULT_DB, METRICS, HistoryStore, git_commit,
+                                machine_fingerprint, resolve_commit)
+from benchmarks.runner import environment
+
+HIGHER_IS_BETTER = {'ticks_per_second'}
+DEFAULT_METRICS = ['ticks_per_second', 'mean_ms', 'p99_ms', 'peak_memory_kb']
+MIN_RUNS = 5  # Fewer runs give bootstrap intervals too narrow to trust
+
+
+def bootstrap_change(base, head, resamples=10000, confidence=0.95, seed=0):
+    """
+    Relative change in the mean from base to head with a bootstrap interval
+
+    Args:
+        base: Base commit's values
+        head: Head commit's values
+        resamples: Bootstrap resamples
+        confidence: Interval coverage
+        seed: Resampling seed (results are reproducible)
+
+    Returns:
+        tuple: (change, interval low, interval high) as fractions (0.05 = +5%)
+    """
+    base = np.asarray(base, dtype=np.float64)
+    head = np.asarray(head, dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    base_means = rng.choice(base, (resamples, len(base))).mean(axis=1)
+    head_means = rng.choice(head, (resamples, len(head))).mean(axis=1)
+    changes = head_means / base_means - 1
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.percentile(changes, (tail, 100 - tail)).tolist()
+    return float(head.mean() / base.mean() - 1), low, high
+
+
+def parse_ref(ref):
+    """
+    Commit and dirtiness for a command line ref
+
+    Returns:
+        tuple: (full commit hash, True for runs with uncommitted changes)
+    """
+    dirty = ref.endswith('+')
+    return resolve_commit(ref.rstrip('+')), dirty
+
+
+def compare(store, base, head, machine, metrics=DEFAULT_METRICS, threshold=0.02,
+            resamples=10000, confidence=0.95):
+    """
+    Compare every scenario workload both commits have runs for
+
+    Args:
+        store: HistoryStore
+        base: (commit, dirty) to compare against
+        head: (commit, dirty) to check
+        machine: Machine fingerprint
+        metrics: Names in METRICS
+        threshold: Smallest relative change flagged as a regression
+        resamples: Bootstrap resamples
+        confidence: Interval coverage
+
+    Returns:
+        list: One dict per (scenario, workload, metric) with the runs on
+            each side, means, change, interval and 'significant'/'regression'
+            flags (None when either side has fewer than MIN_RUNS runs)
+    """
+    rows = []
+    scenarios = sorted(set(store.scenarios(*base, machine)) & set(store.scenarios(*head, machine)))
+    for scenario in scenarios:
+        workloads = sorted(set(store.workloads(*base, scenario, machine))
+                           & set(store.workloads(*head, scenario, machine)))
+        for workload in workloads:
+            for metric in metrics:
+                base_values = store.samples(*base, scenario, machine, metric, workload)
+                head_values = store.samples(*head, scenario, machine, metric, workload)
+                row = {
+                    'scenario': scenario, 'workload': workload, 'metric': metric,
+                    'base_runs': len(base_values), 'head_runs': len(head_values),
+                    'base_mean': float(np.mean(base_values)) if base_values else None,
+                    'head_mean': float(np.mean(head_values)) if head_values else None,
+                    'change': None, 'low': None, 'high': None,
+                    'significant': None, 'regression': None,
+                }
+                if len(base_values) >= MIN_RUNS and len(head_values) >= MIN_RUNS:
+                    change, low, high = bootstrap_change(base_values, head_values, resamples,
+                                                         confidence)
+                    significant = low > 0 or high < 0
+                    worse = -change if metric in HIGHER_IS_BETTER else change
+                    row.update(change=change, low=low, high=high, significant=significant,
+                               regression=significant and worse > threshold)
+                rows.append(row)
+    return rows
+
+
+def label(ref):
+    """Short form of a (commit, dirty) pair"""
+    return f"{ref[0][:10]}{'+' if ref[1] else ''}"
+
+
+def format_row(row):
+    """One table line for a compare() row"""
+    key = f"{row['scenario']:<14} {row['metric']:<17}"
+    if row['change'] is None:
+        return (f"{key} insufficient data ({row['base_runs']} vs {row['head_runs']}, "
+                f"need {MIN_RUNS} each)")
+    if row['regression']:
+        verdict = "REGRESSION"
+    elif row['significant']:
+        verdict = "changed"
+    else:
+        verdict = ""
+    return (f"{key} {row['base_mean']:>12,.3f} -> {row['head_mean']:>12,.3f}  "
+            f"{row['change']:+7.1%} [{row['low']:+7.1%}, {row['high']:+7.1%}]  {verdict}")
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.compare',
+                                     description="Flag benchmark regressions between two commits")
+    parser.add_argument('base', nargs='?', help="commit to compare against ('+' suffix: uncommitted runs)")
+    parser.add_argument('head', nargs='?', help="commit to check (default: the current work tree)")
+    parser.add_argument('--db', metavar='FILE', default=DEFAULT_DB,
+                        help="history database (default benchmarks/history.sqlite)")
+    parser.add_argument('--machine', help="machine fingerprint (default: this machine)")
+    parser.add_argument('--metric', action='append', choices=METRICS,
+                        help=f"metric to compare, repeatable (default: {', '.join(DEFAULT_METRICS)})")
+    parser.add_argument('--threshold', type=float, default=2.0,
+                        help="smallest change in percent flagged as a regression (default 2)")
+    parser.add_argument('--confidence', type=float, default=0.95, help="interval coverage (default 0.95)")
+    parser.add_argument('--resamples', type=int, default=10000, help="bootstrap resamples (default 10000)")
+    parser.add_argument('--list', action='store_true', help="list stored commits and exit")
+    args = parser.parse_args(argv)
+
+    machine = args.machine or machine_fingerprint(environment())
+    store = HistoryStore(args.db)
+    try:
+        if args.list or not args.base:
+            print(f"Stored runs on machine {machine}:")
+            for commit, dirty, runs, _ in store.commits(machine):
+                print(f"  {label((commit, dirty)):<11} {runs:>5} runs")
+            return 0
+
+        base = parse_ref(args.base)
+        if args.head:
+            head = parse_ref(args.head)
+        else:
+            head = git_commit()
+        rows = compare(store, base, head, machine, args.metric or DEFAULT_METRICS,
+                       args.threshold / 100, args.resamples, args.confidence)
+    finally:
+        store.close()
+
+    if not rows:
+        print(f"No scenario workload has runs for both {label(base)} and {label(head)} "
+              f"on machine {machine}")
+        return 0
+
+    print(f"{label(base)} -> {label(head)} (machine {machine}, {args.confidence:.0%} bootstrap intervals)")
+    workload = None
+    for row in rows:
+        if (row['scenario'], row['workload']) != workload:
+            workload = (row['scenario'], row['workload'])
+            seed, ticks, entities = row['workload']
+            print(f"{row['scenario']}: seed {seed}, {ticks:,} ticks, {entities:,} entities")
+        print(format_row(row))
+    regressions = [row for row in rows if row['regression']]
+    if regressions:
+        print(f"{len(regressions)} regression(s)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
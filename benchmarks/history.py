@@ -0,0 +1,205 @@
+"""
+Benchmark result history
+Results are kept in a local SQLite database, one row per scenario run,
+keyed by git commit, scenario and machine fingerprint. Numbers are only
+comparable on the same machine, so the fingerprint hashes what decides
+speed: CPU, core count, OS family and the Python/NumPy/pygame versions.
+The exact OS release is stored with each run but not matched on, so
+system updates keep the history usable. Runs are only compared with runs
+of the same workload (seed, timed ticks, entity count).
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import subprocess
+import time
+
+DEFAULT_DB = os.path.join(os.path.dirname(__file__), 'history.sqlite')
+
+# runner.run_scenario() result fields stored per run
+METRICS = ['ticks_per_second', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms',
+           'peak_memory_kb', 'max_rss_kb']
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    created_at REAL NOT NULL,
+    git_commit TEXT NOT NULL,
+    dirty INTEGER NOT NULL,
+    scenario TEXT NOT NULL,
+    machine TEXT NOT NULL,
+    seed INTEGER NOT NULL,
+    ticks INTEGER NOT NULL,
+    entities INTEGER NOT NULL DEFAULT 0,
+    {', '.join(f'{name} REAL' for name in METRICS)},
+    environment TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_key ON runs (git_commit, scenario, machine);
+"""
+
+FINGERPRINT_FIELDS = ['implementation', 'python', 'numpy', 'pygame', 'system',
+                      'machine', 'processor', 'cpu_count']
+
+# run_scenario() fields that define the measured workload
+WORKLOAD = ['seed', 'ticks', 'entities']
+
+
+def machine_fingerprint(environment):
+    """
+    Short hash of the hardware and software a result was measured on
+
+    Args:
+        environment: runner.environment() dict
+
+    Returns:
+        str: 12 hex digits
+    """
+    key = json.dumps([environment.get(field) for field in FINGERPRINT_FIELDS])
+    return hashlib.sha1(key.encode()).hexdigest()[:12]
+
+
+def git_commit(cwd=None):
+    """
+    Current commit of the repository
+
+    Args:
+        cwd: Directory inside the repository (default: this package's)
+
+    Returns:
+        tuple: (commit hash or 'unknown', True if the work tree has changes)
+    """
+    cwd = cwd or os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=cwd, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=cwd,
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown', False
+    return commit, bool(status.strip())
+
+
+def resolve_commit(ref, cwd=None):
+    """Full hash for a git ref (branch, tag, short hash); the ref itself if git can't resolve it"""
+    cwd = cwd or os.path.dirname(os.path.abspath(__file__))
+    try:
+        return subprocess.run(['git', 'rev-parse', '--verify', f'{ref}^{{commit}}'], cwd=cwd,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ref
+
+
+class HistoryStore:
+    """SQLite table of benchmark results"""
+
+    def __init__(self, path=DEFAULT_DB):
+        """
+        Open (and create if needed) a history database
+
+        Args:
+            path: Database file
+        """
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+        columns = [row['name'] for row in self.db.execute("PRAGMA table_info(runs)")]
+        if 'entities' not in columns:  # Databases from before the column existed
+            with self.db:
+                self.db.execute("ALTER TABLE runs ADD COLUMN entities INTEGER NOT NULL DEFAULT 0")
+
+    def add(self, report, commit=None, dirty=None):
+        """
+        Store every result of a runner.run() report
+
+        Args:
+            report: {'environment': ..., 'results': [...]}
+            commit: Commit hash (default: the current one)
+            dirty: Work tree had changes (default: checked with git)
+
+        Returns:
+            int: Rows added
+        """
+        if commit is None:
+            commit, dirty = git_commit()
+        environment = report['environment']
+        machine = machine_fingerprint(environment)
+        now = time.time()
+        rows = [
+            (now, commit, int(bool(dirty)), result['scenario'], machine,
+             *(result.get(name, 0) for name in WORKLOAD),
+             *(result.get(name) for name in METRICS), json.dumps(environment))
+            for result in report['results']
+        ]
+        columns = ['created_at', 'git_commit', 'dirty', 'scenario', 'machine', *WORKLOAD,
+                   *METRICS, 'environment']
+        with self.db:
+            self.db.executemany(
+                f"INSERT INTO runs ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                rows
+            )
+        return len(rows)
+
+    def samples(self, commit, dirty, scenario, machine, metric, workload):
+        """
+        Every stored value of a metric for one key
+
+        Args:
+            commit: Full commit hash or unique prefix
+            dirty: Runs with uncommitted changes (True) or clean runs (False)
+            scenario: Scenario key
+            machine: Machine fingerprint
+            metric: Name in METRICS
+            workload: (seed, ticks, entities) the runs must match
+
+        Returns:
+            list: Values, oldest first
+        """
+        if metric not in METRICS:
+            raise ValueError(f"unknown metric {metric!r}")
+        rows = self.db.execute(
+            f"SELECT {metric} FROM runs WHERE git_commit LIKE ? AND dirty = ? AND scenario = ?"
+            f" AND machine = ? AND seed = ? AND ticks = ? AND entities = ?"
+            f" AND {metric} IS NOT NULL ORDER BY created_at",
+            (commit + '%', int(dirty), scenario, machine, *workload)
+        )
+        return [row[0] for row in rows]
+
+    def workloads(self, commit, dirty, scenario, machine):
+        """(seed, ticks, entities) combinations stored for a scenario"""
+        rows = self.db.execute(
+            "SELECT DISTINCT seed, ticks, entities FROM runs WHERE git_commit LIKE ? AND dirty = ?"
+            " AND scenario = ? AND machine = ? ORDER BY seed, ticks, entities",
+            (commit + '%', int(dirty), scenario, machine)
+        )
+        return [tuple(row) for row in rows]
+
+    def scenarios(self, commit, dirty, machine):
+        """Scenario keys stored for a commit on a machine"""
+        rows = self.db.execute(
+            "SELECT DISTINCT scenario FROM runs WHERE git_commit LIKE ? AND dirty = ? AND machine = ?"
+            " ORDER BY scenario",
+            (commit + '%', int(dirty), machine)
+        )
+        return [row[0] for row in rows]
+
+    def commits(self, machine=None):
+        """
+        Stored commits, newest run first
+
+        Returns:
+            list: (commit, dirty, runs, last run time) tuples
+        """
+        where, args = ("WHERE machine = ?", (machine,)) if machine else ("", ())
+        rows = self.db.execute(
+            f"SELECT git_commit, dirty, COUNT(*), MAX(created_at) AS last FROM runs {where}"
+            f" GROUP BY git_commit, dirty ORDER BY last DESC",
+            args
+        )
+        return [tuple(row) for row in rows]
+
+    def close(self):
+        """Close the database"""
+        self.db.close()
@@ -0,0 +1,188 @@
+"""
+Benchmark runner
+Times every tick of a scenario with perf_counter_ns after a warmup, then
+runs it again under tracemalloc for peak memory (tracing slows the ticks
+down, so the two passes are kept apart).
+"""
+
+import os
+
+# Headless: no window and no audio device, whatever the environment says
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+os.environ['SDL_AUDIODRIVER'] = 'dummy'
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')  # Keep stdout clean for --json -
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import numpy as np
+import pygame
+from benchmarks.scenarios import SCENARIOS
+from benchmarks.history import DEFAULT_DB, HistoryStore, git_commit, machine_fingerprint
+
+try:
+    import resource  # Unix only
+except ImportError:
+    resource = None
+
+
+def run_scenario(scenario, ticks=2000, warmup=200, seed=0, memory_ticks=200):
+    """
+    Benchmark one scenario
+
+    Args:
+        scenario: Scenario from SCENARIOS
+        ticks: Timed ticks
+        warmup: Untimed ticks first (caches, pool growth)
+        seed: Seed for the scenario's setup
+        memory_ticks: Ticks run under tracemalloc for peak memory
+
+    Returns:
+        dict: ticks/second, per-tick latency in milliseconds and peak memory
+    """
+    scenario.setup(seed)
+    for _ in range(warmup):
+        scenario.tick()
+        scenario.after_tick()
+
+    times = np.empty(ticks, dtype=np.int64)
+    clock = time.perf_counter_ns
+    tick = scenario.tick
+    after_tick = scenario.after_tick
+    elapsed = 0
+    for i in range(ticks):
+        start = clock()
+        tick()
+        times[i] = clock() - start
+        elapsed += times[i]
+        after_tick()
+
+    # Peak memory from a fresh start
+    tracemalloc.start()
+    scenario.setup(seed)
+    for _ in range(memory_ticks):
+        scenario.tick()
+        scenario.after_tick()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    latency = times / 1e6
+    p50, p95, p99 = np.percentile(latency, (50, 95, 99)).tolist()
+    return {
+        'scenario': scenario.name,
+        'description': scenario.description,
+        'seed': seed,
+        'ticks': ticks,
+        'entities': scenario.entities,
+        'ticks_per_second': ticks / (elapsed / 1e9) if elapsed else 0.0,
+        'mean_ms': float(latency.mean()),
+        'p50_ms': p50,
+        'p95_ms': p95,
+        'p99_ms': p99,
+        'max_ms': float(latency.max()),
+        'peak_memory_kb': peak / 1024,
+        'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else None,
+    }
+
+
+def environment():
+    """Interpreter and library versions the results were measured with"""
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'numpy': np.__version__,
+        'pygame': pygame.version.ver,
+        'system': platform.system(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def run(names=None, ticks=2000, warmup=200, seed=0, memory_ticks=200, repeat=1, log=print):
+    """
+    Benchmark several scenarios
+
+    Args:
+        names: Scenario keys (default: all)
+        ticks: Timed ticks per scenario
+        warmup: Untimed ticks per scenario
+        seed: Seed for every scenario
+        memory_ticks: Ticks per scenario under tracemalloc
+        repeat: Runs per scenario (interleaved, so slow drift hits every
+            scenario alike)
+        log: Called with a summary line per run (None for silence)
+
+    Returns:
+        dict: {'environment': ..., 'results': [run_scenario() result, ...]}
+    """
+    results = []
+    for _ in range(repeat):
+        for name in names or SCENARIOS:
+            result = run_scenario(SCENARIOS[name], ticks, warmup, seed, memory_ticks)
+            results.append(result)
+            if log:
+                log(format_result(result))
+    return {'environment': environment(), 'results': results}
+
+
+def format_result(result):
+    """One table row for a result"""
+    return (f"{result['scenario']:<14} {result['ticks_per_second']:>10,.0f} ticks/s  "
+            f"mean {result['mean_ms']:7.3f} ms  p99 {result['p99_ms']:7.3f} ms  "
+            f"max {result['max_ms']:7.3f} ms  peak {result['peak_memory_kb']:8,.0f} KiB")
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description="Headless fixed-seed benchmarks")
+    parser.add_argument('scenarios', nargs='*', metavar='SCENARIO',
+                        help=f"scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument('--ticks', type=int, default=2000, help="timed ticks per scenario (default 2000)")
+    parser.add_argument('--warmup', type=int, default=200, help="untimed ticks first (default 200)")
+    parser.add_argument('--seed', type=int, default=0, help="scenario seed (default 0)")
+    parser.add_argument('--memory-ticks', type=int, default=200,
+                        help="ticks traced for peak memory (default 200)")
+    parser.add_argument('--repeat', type=int, default=1,
+                        help="runs per scenario; compare needs at least 5 (default 1)")
+    parser.add_argument('--json', metavar='FILE', help="write results as JSON ('-' for stdout)")
+    parser.add_argument('--save', action='store_true',
+                        help="add the results to the history database for the current commit")
+    parser.add_argument('--db', metavar='FILE', default=DEFAULT_DB,
+                        help="history database (default benchmarks/history.sqlite)")
+    parser.add_argument('--list', action='store_true', help="list scenarios and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, scenario in SCENARIOS.items():
+            print(f"{name:<14} {scenario.description}")
+        return
+
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    to_stdout = args.json == '-'
+    log = (lambda line: print(line, file=sys.stderr)) if to_stdout else print
+    report = run(args.scenarios, args.ticks, args.warmup, args.seed, args.memory_ticks,
+                 args.repeat, log)
+
+    if args.save:
+        commit, dirty = git_commit()
+        store = HistoryStore(args.db)
+        count = store.add(report, commit, dirty)
+        store.close()
+        log(f"Saved {count} runs for {commit[:10]}{' (uncommitted changes)' if dirty else ''} "
+            f"on machine {machine_fingerprint(report['environment'])}")
+
+    if to_stdout:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    elif args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
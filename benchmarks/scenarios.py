@@ -0,0 +1,197 @@
+"""
+Benchmark scenarios
+Every scenario builds its state from a fixed seed in setup() and does one
+unit of work per tick(); the runner times the ticks.
+
+Arena scenarios step a Simulation with a scripted player that chases the
+nearest enemy and attacks in range. When the game leaves the playing state
+they restore the snapshot taken at setup (outside the timed tick), so every
+tick measures the same kind of work.
+"""
+
+import numpy as np
+from config import *
+from game.simulation import Simulation, Action
+from game.enemy_pool import TYPE_BOSS
+
+ENEMY_MIX = ['goblin', 'skeleton', 'goblin_archer', 'slime']
+
+
+def chase_action(sim):
+    """
+    Scripted player: move toward the nearest enemy, attack it in range,
+    drink a potion below a third of max HP
+
+    Args:
+        sim: Simulation to act in
+
+    Returns:
+        Action: Action for the next tick
+    """
+    player = sim.player
+    use_potion = player.hp < player.max_hp / 3
+    pool = sim.enemies
+    indices = pool.indices()
+    if len(indices) == 0:
+        return Action(use_potion=use_potion)
+
+    dx = pool.x[indices] - player.x
+    dy = pool.y[indices] - player.y
+    distances = dx * dx + dy * dy
+    nearest = int(distances.argmin())
+    step = PLAYER_SPEED * (sim.dt * FPS)
+    move_x = int(np.sign(dx[nearest])) if abs(dx[nearest]) > step else 0
+    move_y = int(np.sign(dy[nearest])) if abs(dy[nearest]) > step else 0
+    attack = bool(distances[nearest] <= MELEE_RANGE * MELEE_RANGE)
+    return Action(move_x, move_y, attack, use_potion)
+
+
+class ArenaScenario:
+    """A Simulation started on a given floor/wave, optionally with extra enemies"""
+
+    def __init__(self, name, description, floor=1, wave=1, bosses=0, enemies=0,
+                 waves=True, invulnerable=False, keep_alive=False):
+        """
+        Initialize scenario
+
+        Args:
+            name: Scenario key
+            description: One-line summary
+            floor: Floor to start on
+            wave: Wave to start on
+            bosses: Dark knights spawned at the start
+            enemies: Mixed regular enemies spawned at the start
+            waves: Keep the floor/wave's own spawn queue
+            invulnerable: Give the player effectively unlimited HP
+            keep_alive: Respawn killed enemies and bosses at the right
+                edge, so the crowd never thins out
+        """
+        self.name = name
+        self.description = description
+        self.floor = floor
+        self.wave = wave
+        self.bosses = bosses
+        self.enemies = enemies
+        self.waves = waves
+        self.invulnerable = invulnerable
+        self.keep_alive = keep_alive
+        self.sim = None
+        self.start = None
+        self.rng = None
+
+    @property
+    def entities(self):
+        """Extra enemies and bosses spawned at setup"""
+        return self.bosses + self.enemies
+
+    def setup(self, seed):
+        """Build the starting state"""
+        sim = Simulation()
+        sim.reset(seed=seed)
+        sim.current_floor = self.floor
+        sim.current_wave = self.wave
+        sim.start_floor()
+        if not self.waves:
+            sim.wave_spawner.enemies_to_spawn = []
+        if self.invulnerable:
+            sim.player.max_hp = sim.player.hp = 10 ** 9
+
+        self.rng = np.random.default_rng(seed)
+        for _ in range(self.bosses):
+            sim.enemies.spawn_boss(*self._position(), 'dark_knight')
+        for _ in range(self.enemies):
+            sim.enemies.spawn(*self._position(), self._enemy_type())
+
+        self.sim = sim
+        self.start = sim.snapshot()
+
+    def _position(self):
+        """Random spawn point in the right half of the arena"""
+        x = ARENA_X + ARENA_WIDTH // 2 + self.rng.integers(0, ARENA_WIDTH // 2 - SPRITE_SIZE * 2)
+        y = ARENA_Y + self.rng.integers(0, ARENA_HEIGHT - SPRITE_SIZE * 2)
+        return float(x), float(y)
+
+    def _enemy_type(self):
+        """Random regular enemy type"""
+        return ENEMY_MIX[int(self.rng.integers(len(ENEMY_MIX)))]
+
+    def tick(self):
+        """Choose an action and step once"""
+        sim = self.sim
+        sim.step(chase_action(sim))
+        if self.keep_alive:
+            self.refill()
+
+    def refill(self):
+        """Respawn killed enemies and bosses at the right edge"""
+        pool = self.sim.enemies
+        bosses = int(TYPE_BOSS[pool.type_id[pool.indices()]].sum())
+        x = ARENA_X + ENEMY_SPAWN_X
+        for _ in range(self.enemies - (len(pool) - bosses)):
+            pool.spawn(x, self._position()[1], self._enemy_type())
+        for _ in range(self.bosses - bosses):
+            pool.spawn_boss(x, self._position()[1], 'dark_knight')
+
+    def after_tick(self):
+        """Restart from the starting snapshot once the game stops (not timed)"""
+        if self.sim.state != 'playing':
+            self.sim.restore(self.start)
+
+
+class MenuScenario:
+    """Full-screen menu, character creation and end screens drawn through main.Game"""
+
+    SCREENS = [('menu', 0), ('menu', 1), ('menu', 2),
+               ('character_creation', 0), ('character_creation', 1), ('character_creation', 2),
+               ('game_over', 0), ('victory', 0)]
+    entities = 0  # Nothing is simulated
+
+    def __init__(self, name, description):
+        """
+        Initialize scenario
+
+        Args:
+            name: Scenario key
+            description: One-line summary
+        """
+        self.name = name
+        self.description = description
+        self.game = None
+        self.ticks = 0
+
+    def setup(self, seed):
+        """Create the game window (SDL must already be headless) and a game to show"""
+        import main  # Opens the display, so only when this scenario runs
+
+        game = self.game or main.Game()
+        game.player_name = "Bench"
+        game.sim = Simulation()
+        game.sim.reset(seed=seed)
+        self.game = game
+        self.ticks = 0
+
+    def tick(self):
+        """Draw the next screen in the cycle"""
+        game = self.game
+        state, step = self.SCREENS[self.ticks % len(self.SCREENS)]
+        game.state = state
+        game.menu_selection = step
+        game.creation_step = step
+        game.draw()
+        self.ticks += 1
+
+    def after_tick(self):
+        """Nothing to restart"""
+
+
+SCENARIOS = {
+    scenario.name: scenario for scenario in [
+        ArenaScenario('floor1_wave1', "Floor 1, wave 1 as the game starts"),
+        ArenaScenario('floor5_wave5', "Floor 5, wave 5: the largest regular wave", floor=5, wave=5),
+        ArenaScenario('boss_fight', "Dark knight on floor 5 without a wave", floor=5, wave=5,
+                      bosses=1, waves=False),
+        ArenaScenario('stress_500', "500 mixed enemies kept alive around an invulnerable player",
+                      enemies=500, waves=False, invulnerable=True, keep_alive=True),
+        MenuScenario('menu_ui', "Menu, character creation and end screens (rendering only)"),
+    ]
+}
@@ -0,0 +1,155 @@
+"""
+Stress mode
+Runs the arena with thousands of mixed enemies plus dark knights around an
+invulnerable scripted player, respawning the dead so the crowd never thins
+out, and reports where each tick's time goes (FrameProfiler scopes, and
+optionally the top functions from cProfile). With rendering on, every tick
+is also drawn through main.Game, so the draw phases show up too.
+
+    python main.py --stress 3000 --stress-bosses 10
+    python -m benchmarks.stress 5000 --headless
+"""
+
+import argparse
+import cProfile
+import io
+import pstats
+import time
+from benchmarks.scenarios import ArenaScenario, chase_action
+from game.profiler import FrameProfiler
+
+
+def run_stress(enemies=2000, bosses=4, ticks=600, render=True, seed=0, cprofile=0, log=print):
+    """
+    Run the stress arena and measure it
+
+    Args:
+        enemies: Regular enemies kept alive (goblin/skeleton/goblin_archer/slime mix)
+        bosses: Dark knights kept alive
+        ticks: Ticks to run (fewer if the window is closed)
+        render: Draw every tick in a game window (SDL_VIDEODRIVER=dummy
+            renders off-screen)
+        seed: Seed for the arena and spawns
+        cprofile: Also run cProfile and report this many top functions (0: off)
+        log: Called with each report line (None for silence)
+
+    Returns:
+        dict: ticks run, ticks/second, enemies alive at the end, per-scope
+            {'mean_ms', 'share'} and cProfile lines
+    """
+    scenario = ArenaScenario('stress', "Stress arena", bosses=bosses, enemies=enemies,
+                             waves=False, invulnerable=True, keep_alive=True)
+    scenario.setup(seed)
+    sim = scenario.sim
+    profiler = FrameProfiler(window=max(ticks, 1))
+    sim.profiler = profiler
+
+    game = None
+    if render:
+        import pygame
+        import main  # Opens the display, so only when rendering
+
+        game = main.Game()
+        game.player_name = "Stress"
+        game.sim = sim
+        game.state = 'playing'
+        game.profiler = profiler
+
+    profile = cProfile.Profile() if cprofile else None
+    if profile:
+        profile.enable()
+    start = time.perf_counter()
+    count = 0
+    for count in range(1, ticks + 1):
+        profiler.start_frame()
+        if game:
+            if any(event.type == pygame.QUIT for event in pygame.event.get()):
+                break
+        action = chase_action(sim)
+        profiler.lap('agent')
+        sim.step(action)
+        scenario.refill()
+        profiler.lap('spawner')
+        if game:
+            game.draw()
+        profiler.end_frame()
+        scenario.after_tick()
+    elapsed = time.perf_counter() - start
+    if profile:
+        profile.disable()
+
+    scopes = {name: {'mean_ms': mean, 'share': share}
+              for name, (mean, share) in profiler.summary().items()}
+    report = {
+        'enemies': enemies,
+        'bosses': bosses,
+        'render': render,
+        'ticks': count,
+        'ticks_per_second': count / elapsed if elapsed else 0.0,
+        'alive': len(sim.enemies),
+        'pool_capacity': sim.enemies.capacity,
+        'scopes': scopes,
+        'functions': [],
+    }
+    if profile:
+        out = io.StringIO()
+        pstats.Stats(profile, stream=out).sort_stats('tottime').print_stats(cprofile)
+        report['functions'] = [line for line in out.getvalue().splitlines() if line.strip()]
+
+    if log:
+        for line in format_report(report):
+            log(line)
+    if game:
+        pygame.quit()
+    return report
+
+
+def format_report(report):
+    """Report lines for a run_stress() result"""
+    lines = [
+        f"Stress: {report['enemies']:,} enemies + {report['bosses']} bosses, "
+        f"{report['ticks']:,} ticks, rendering {'on' if report['render'] else 'off'}",
+        f"  {report['ticks_per_second']:,.1f} ticks/s, {report['alive']:,} alive "
+        f"(pool capacity {report['pool_capacity']:,})",
+        f"  {'scope':<14} {'ms/tick':>9} {'share':>7}",
+    ]
+    for name, scope in report['scopes'].items():
+        if name == 'frame' or scope['mean_ms'] > 0:
+            lines.append(f"  {name:<14} {scope['mean_ms']:>9.3f} {scope['share']:>7.1%}")
+    if report['functions']:
+        lines.append("  Top functions by own time:")
+        lines.extend(f"  {line}" for line in report['functions'])
+    return lines
+
+
+def add_arguments(parser, prefix=''):
+    """
+    Add the stress options to an argument parser
+
+    Args:
+        parser: argparse.ArgumentParser
+        prefix: Option prefix ('stress-' in main.py)
+    """
+    parser.add_argument(f'--{prefix}bosses', metavar='N', type=int, default=4,
+                        help="dark knights kept alive (default 4)")
+    parser.add_argument(f'--{prefix}ticks', metavar='N', type=int, default=600,
+                        help="ticks to run (default 600)")
+    parser.add_argument(f'--{prefix}seed', metavar='N', type=int, default=0, help="seed (default 0)")
+    parser.add_argument(f'--{prefix}cprofile', metavar='N', type=int, default=0,
+                        help="also list the N functions with the most own time")
+    parser.add_argument('--headless', action='store_true', help="simulate only, no rendering")
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.stress',
+                                     description="Arena with thousands of enemies")
+    parser.add_argument('enemies', nargs='?', type=int, default=2000,
+                        help="regular enemies kept alive (default 2000)")
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+    run_stress(args.enemies, args.bosses, args.ticks, not args.headless, args.seed, args.cprofile)
+
+
+if __name__ == "__main__":
+    main()
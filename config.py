@@ -7,6 +7,16 @@ WINDOW_HEIGHT = 700
 FPS = 60
 TITLE = "AI Dungeon Crawler"
 
+# Simulation Settings
+SIM_RATE = FPS  # Simulation ticks per second (independent of rendering)
+SIM_DT = 1.0 / SIM_RATE  # Fixed timestep (seconds per tick)
+MAX_CATCH_UP_TICKS = 5  # Most ticks run per rendered frame before the game slows down
+# Speeds are in pixels per tick at FPS; movement is scaled by dt * FPS
+
+# Profiling (F3 toggles the frame-time overlay)
+PROFILER_WINDOW = 300  # Frames kept for the rolling percentiles
+PROFILER_REFRESH = 30  # Frames between overlay updates
+
 # Layout - Horizontal Arena Design
 LEFT_PANEL_WIDTH = 250
 RIGHT_PANEL_WIDTH = 200
@@ -169,8 +179,9 @@ ITEM_SLOT_SIZE = 60
 ITEM_SLOT_PADDING = 10
 
 # AI Training Settings (for Phase 2)
-TRAINING_MODE = False
-TRAINING_SPEED = 1000
+TRAINING_MODE = False  # Fast-forward: no frame cap, games restart by themselves
+TRAINING_SPEED = 1000  # Target speed as a multiple of real time (0 for as fast as possible)
+TRAINING_RENDER_EVERY = 1000  # Ticks between rendered frames when fast-forwarding (0 for none)
 
 # Skills (placeholder for AI system)
 SKILLS = {
@@ -4,8 +4,10 @@ Handles rooms, floors, and dungeon layout
 """
 
 import pygame
-import random
+import numpy as np
 from config import *
+from game.flow_field import FlowField
+from game.rng import RngContext
 
 class Wall:
     """A wall obstacle in a room"""
@@ -31,43 +33,92 @@ class Wall:
 class Room:
     """A single room in the dungeon"""
     
-    def __init__(self, width=400, height=400):
+    def __init__(self, width=400, height=400, x=0, y=0):
+        self.x = x  # Screen position of the room's top-left corner
+        self.y = y
         self.width = width
         self.height = height
         self.walls = []
         self.enemies = []
         self.items = []
         
+        # Compiled collision data (rebuilt when walls are added)
+        self.wall_rects = []
+        self.occupancy = None  # Bool bitmap, one cell per pixel
+        self.grid_x = 0  # Screen position of occupancy[0, 0]
+        self.grid_y = 0
+        self._wall_sums = None  # Summed-area table of occupancy
+        self._compiled_walls = -1
+        
+        # Enemy navigation around obstacles (only rooms with interior walls need it)
+        self.flow_field = None
+        
         # Room boundaries (outer walls)
         self.create_boundary_walls()
     
     def create_boundary_walls(self):
         """Create walls around the room perimeter"""
         wall_thickness = 10
+        x, y = self.x, self.y
         
         # Top wall
-        self.walls.append(Wall(0, 0, self.width, wall_thickness))
+        self.walls.append(Wall(x, y, self.width, wall_thickness))
         
         # Bottom wall
-        self.walls.append(Wall(0, self.height - wall_thickness, self.width, wall_thickness))
+        self.walls.append(Wall(x, y + self.height - wall_thickness, self.width, wall_thickness))
         
         # Left wall
-        self.walls.append(Wall(0, 0, wall_thickness, self.height))
+        self.walls.append(Wall(x, y, wall_thickness, self.height))
         
         # Right wall
-        self.walls.append(Wall(self.width - wall_thickness, 0, wall_thickness, self.height))
+        self.walls.append(Wall(x + self.width - wall_thickness, y, wall_thickness, self.height))
     
     def add_interior_walls(self):
         """Add some obstacles inside the room"""
         # Add a few pillars/obstacles
+        x, y = self.x, self.y
+        
         # Pillar in upper left area
-        self.walls.append(Wall(80, 80, 40, 40))
+        self.walls.append(Wall(x + 80, y + 80, 40, 40))
         
         # Pillar in upper right area
-        self.walls.append(Wall(280, 80, 40, 40))
+        self.walls.append(Wall(x + 280, y + 80, 40, 40))
         
         # Pillar in bottom center
-        self.walls.append(Wall(180, 280, 40, 40))
+        self.walls.append(Wall(x + 180, y + 280, 40, 40))
+        
+        # Let enemies path around the pillars
+        self.flow_field = FlowField(self)
+    
+    def compile_walls(self):
+        """
+        Bake the walls into a cached Rect list and an occupancy bitmap
+        
+        A summed-area table over the bitmap answers "does this rect touch a
+        wall" with four lookups, however many walls the room has. Called
+        automatically when walls have been added since the last compile.
+        """
+        self.wall_rects = [wall.get_rect() for wall in self.walls]
+        
+        # Cover the room and every wall
+        left = min([self.x] + [rect.left for rect in self.wall_rects])
+        top = min([self.y] + [rect.top for rect in self.wall_rects])
+        right = max([self.x + self.width] + [rect.right for rect in self.wall_rects])
+        bottom = max([self.y + self.height] + [rect.bottom for rect in self.wall_rects])
+        
+        occupancy = np.zeros((bottom - top, right - left), dtype=bool)
+        for rect in self.wall_rects:
+            occupancy[rect.top - top:rect.bottom - top, rect.left - left:rect.right - left] = True
+        
+        sums = np.zeros((bottom - top + 1, right - left + 1), dtype=np.int32)
+        np.cumsum(occupancy, axis=0, out=sums[1:, 1:])
+        np.cumsum(sums[1:, 1:], axis=1, out=sums[1:, 1:])
+        
+        self.occupancy = occupancy
+        self.grid_x = left
+        self.grid_y = top
+        self._wall_sums = sums
+        self._compiled_walls = len(self.walls)
     
     def check_collision(self, rect):
         """
@@ -79,10 +130,46 @@ class Room:
         Returns:
             bool: True if collision detected
         """
-        for wall in self.walls:
-            if rect.colliderect(wall.get_rect()):
-                return True
-        return False
+        if self._compiled_walls != len(self.walls):
+            self.compile_walls()
+        
+        sums = self._wall_sums
+        height, width = self.occupancy.shape
+        left = min(max(rect.left - self.grid_x, 0), width)
+        right = min(max(rect.right - self.grid_x, 0), width)
+        top = min(max(rect.top - self.grid_y, 0), height)
+        bottom = min(max(rect.bottom - self.grid_y, 0), height)
+        
+        return (sums.item(bottom, right) - sums.item(top, right)
+                - sums.item(bottom, left) + sums.item(top, left)) > 0
+    
+    def collides(self, x, y, width, height):
+        """
+        check_collision for many rects at once
+        
+        Args:
+            x: Rect x positions (array, truncated like pygame.Rect)
+            y: Rect y positions (array, same shape as x)
+            width: Rect widths (scalar or array)
+            height: Rect heights (scalar or array)
+            
+        Returns:
+            ndarray: True where the rect overlaps a wall
+        """
+        if self._compiled_walls != len(self.walls):
+            self.compile_walls()
+        
+        sums = self._wall_sums
+        rows, cols = self.occupancy.shape
+        left = np.trunc(x) - self.grid_x
+        top = np.trunc(y) - self.grid_y
+        right = np.clip(left + width, 0, cols).astype(np.intp)
+        bottom = np.clip(top + height, 0, rows).astype(np.intp)
+        left = np.clip(left, 0, cols).astype(np.intp)
+        top = np.clip(top, 0, rows).astype(np.intp)
+        
+        return (sums[bottom, right] - sums[top, right]
+                - sums[bottom, left] + sums[top, left]) > 0
     
     def draw(self, surface):
         """Draw the room"""
@@ -141,8 +228,9 @@ class Floor:
 class Dungeon:
     """Main dungeon manager"""
     
-    def __init__(self, num_floors=5):
+    def __init__(self, num_floors=5, rng=None):
         self.num_floors = num_floors
+        self.rng = rng or RngContext()  # Enemy types/positions and loot
         self.floors = []
         self.current_floor = 0
         
@@ -204,14 +292,14 @@ class Dungeon:
             attempts = 0
             spawned = False
             while attempts < 50:  # Try up to 50 times to find valid position
-                x = random.randint(100, room.width - 100)
-                y = random.randint(100, room.height - 100)
+                x = self.rng.spawn_positions.randint(100, room.width - 100)
+                y = self.rng.spawn_positions.randint(100, room.height - 100)
                 
                 # Check if position is valid (not in wall)
                 test_rect = pygame.Rect(x, y, 32, 32)
                 if not room.check_collision(test_rect):
                     # Choose enemy type
-                    enemy_type = random.choice(enemy_types)
+                    enemy_type = self.rng.spawn_types.choice(enemy_types)
                     enemy = enemy_class(x, y, enemy_type)
                     room.enemies.append(enemy)
                     spawned_count += 1
@@ -224,7 +312,7 @@ class Dungeon:
             if not spawned:
                 x = room.width // 2 + (i * 40)  # Spread out in center
                 y = room.height // 2
-                enemy_type = random.choice(enemy_types)
+                enemy_type = self.rng.spawn_types.choice(enemy_types)
                 enemy = enemy_class(x, y, enemy_type)
                 room.enemies.append(enemy)
                 spawned_count += 1
@@ -239,11 +327,12 @@ class Dungeon:
         room = self.get_current_room()
         
         # 50% chance to spawn a potion in each room
-        if random.random() < 0.5:
+        loot = self.rng.loot
+        if loot.random() < 0.5:
             attempts = 0
             while attempts < 30:
-                x = random.randint(50, room.width - 50)
-                y = random.randint(50, room.height - 50)
+                x = loot.randint(50, room.width - 50)
+                y = loot.randint(50, room.height - 50)
                 
                 # Check if position is valid
                 test_rect = pygame.Rect(x, y, 20, 20)
@@ -107,19 +107,38 @@ class Enemy:
             dx = dx / distance
             dy = dy / distance
             
+            # Speed is pixels per tick at FPS
+            speed = self.speed * (dt * FPS)
+            step_x = dx * speed
+            step_y = dy * speed
+            
+            # Path around obstacles along the room's flow field
+            if room and room.flow_field:
+                room.flow_field.update(target.x, target.y)
+                step_x, step_y = room.flow_field.steer(self.x, self.y, step_x, step_y, speed)
+            
             # Store old position
             old_x = self.x
             old_y = self.y
             
             # Try to move
-            self.x += dx * self.speed
-            self.y += dy * self.speed
+            self.x += step_x
+            self.y += step_y
             
             # Check collision with walls
             if room and room.check_collision(self.get_rect()):
                 # Hit a wall, revert movement
                 self.x = old_x
                 self.y = old_y
+                
+                # Around obstacles, slide along the wall on one axis instead
+                if room.flow_field:
+                    self.x = old_x + step_x
+                    if room.check_collision(self.get_rect()):
+                        self.x = old_x
+                        self.y = old_y + step_y
+                        if room.check_collision(self.get_rect()):
+                            self.y = old_y
     
     def move_away(self, target, dt, room=None):
         """
@@ -144,8 +163,9 @@ class Enemy:
             old_y = self.y
             
             # Try to move
-            self.x += dx * self.speed
-            self.y += dy * self.speed
+            speed = self.speed * (dt * FPS)
+            self.x += dx * speed
+            self.y += dy * speed
             
             # Check collision with walls
             if room and room.check_collision(self.get_rect()):
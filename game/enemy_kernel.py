@@ -0,0 +1,199 @@
+"""
+Batched enemy behaviour kernel
+Runs Enemy.update / Boss.update for every enemy in an EnemyPool as one
+NumPy pass: distances, state transitions, movement with wall collision
+and attack triggers. Results match the per-object Enemy/Boss code exactly
+(same float64 operations in the same order), so the object classes remain
+the reference implementation.
+
+Small batches are cheaper per object (NumPy has a fixed cost per call), so
+below BATCH_THRESHOLD living enemies both functions run the views instead.
+"""
+
+import numpy as np
+from config import *
+from game.enemy_pool import STATE_IDS, TYPE_BOSS
+
+CHASE = STATE_IDS['chase']
+ATTACK = STATE_IDS['attack']
+RETREAT = STATE_IDS['retreat']
+
+BATCH_THRESHOLD = 32  # Fewer enemies than this use the per-object path
+
+
+def _hit_player(player, raw_damage):
+    """Apply a batch of hits through Player.take_damage's defense rule"""
+    if len(raw_damage) == 0:
+        return
+    actual = np.maximum(1, raw_damage - player.defense).sum()
+    player.hp = max(0, player.hp - float(actual))
+
+
+def update_enemies(pool, player, dt, room=None, profiler=None):
+    """
+    Enemy.update / Boss.update for every living enemy in the pool
+
+    Args:
+        pool: EnemyPool to update in place
+        player: Player to chase and attack
+        dt: Delta time in seconds
+        room: Room for wall collision (optional)
+        profiler: FrameProfiler; the batched path charges its wall checks
+            to 'collision' (the per-object path can't separate them)
+    """
+    idx = pool.indices()
+    if len(idx) < BATCH_THRESHOLD:
+        views = pool.views
+        for i in idx:
+            views[i].update(dt, player, room)
+        return
+
+    idx = idx[pool.alive[idx]]
+
+    x = pool.x[idx]
+    y = pool.y[idx]
+    speed = pool.speed[idx] * (dt * FPS)  # Pixels per tick at FPS
+    state = pool.state[idx]
+
+    # Update cooldowns
+    cooldown = pool.attack_cooldown[idx]
+    cooldown = np.where(cooldown > 0, cooldown - dt, cooldown)
+    ready = cooldown <= 0
+
+    dx = player.x - x
+    dy = player.y - y
+    distance = np.sqrt(dx * dx + dy * dy)
+
+    boss = TYPE_BOSS[pool.type_id[idx]]
+    ranged = pool.ranged[idx] & ~boss
+    melee = ~ranged & ~boss
+
+    # Melee: attack when close, otherwise chase
+    melee_attack = melee & (distance < 50)
+    melee_chase = melee & ~melee_attack
+
+    # Ranged: retreat when too close, shoot in range, otherwise chase
+    ranged_retreat = ranged & (distance < 100)
+    ranged_attack = ranged & ~ranged_retreat & (distance < 250)
+    ranged_chase = ranged & ~ranged_retreat & ~ranged_attack
+
+    state[melee_attack | ranged_attack] = ATTACK
+    state[melee_chase | ranged_chase] = CHASE
+    state[ranged_retreat] = RETREAT
+    strike = (melee_attack | ranged_attack) & ready
+
+    # Boss: release a charged heavy attack, start charging up close, else chase
+    heavy_damage = np.zeros(0)
+    if boss.any():
+        heavy_cooldown = pool.heavy_attack_cooldown[idx]
+        heavy_cooldown = np.where(boss & (heavy_cooldown > 0), heavy_cooldown - dt, heavy_cooldown)
+        charging = pool.charging_heavy[idx]
+        charge = pool.heavy_attack_charge[idx]
+
+        was_charging = boss & charging
+        charge = np.where(was_charging, charge + dt, charge)
+        release = was_charging & (charge >= 1.0)
+        heavy_damage = pool.damage[idx][release & (distance <= 80)] * 2
+        charging = charging & ~release
+        charge[release] = 0
+
+        close = boss & ~was_charging & (distance < 60)
+        start_charge = close & (heavy_cooldown <= 0)
+        charging = charging | start_charge
+        charge[start_charge] = 0
+        heavy_cooldown[start_charge] = 5.0
+        strike |= close & ~start_charge & ready & (distance <= 50)
+
+        boss_chase = boss & ~was_charging & ~close
+        state[boss_chase] = CHASE
+        pool.heavy_attack_cooldown[idx] = heavy_cooldown
+        pool.heavy_attack_charge[idx] = charge
+        pool.charging_heavy[idx] = charging
+    else:
+        boss_chase = boss
+
+    # Attacks (perform_attack)
+    cooldown[strike] = 1.0
+    _hit_player(player, np.concatenate((pool.damage[idx][strike], heavy_damage)))
+
+    # Movement (move_toward / move_away), reverted on wall collision
+    away = ranged_retreat
+    moving = (melee_chase | ranged_chase | boss_chase | away) & (distance > 0)
+    if moving.any():
+        dx = np.where(away, -dx, dx)
+        dy = np.where(away, -dy, dy)
+        step_x = np.divide(dx, distance, out=np.zeros_like(dx), where=moving) * speed
+        step_y = np.divide(dy, distance, out=np.zeros_like(dy), where=moving) * speed
+
+        # Chasers path around obstacles along the room's flow field
+        if room is not None and room.flow_field:
+            room.flow_field.update(player.x, player.y)
+            flow_x, flow_y = room.flow_field.steer_many(x, y, step_x, step_y, speed)
+            step_x = np.where(away, step_x, flow_x)
+            step_y = np.where(away, step_y, flow_y)
+
+        new_x = x + step_x
+        new_y = y + step_y
+        moved = moving
+        if profiler:
+            profiler.lap('enemy_ai')
+        if room is not None:
+            width = pool.width[idx]
+            height = pool.height[idx]
+            blocked = moving & room.collides(new_x, new_y, width, height)
+            moved = moving & ~blocked
+
+            # Around obstacles, blocked chasers slide along the wall on one axis
+            if room.flow_field:
+                blocked &= ~away
+                slide_x = blocked & ~room.collides(new_x, y, width, height)
+                slide_y = blocked & ~slide_x & ~room.collides(x, new_y, width, height)
+                x = np.where(slide_x, new_x, x)
+                y = np.where(slide_y, new_y, y)
+        x = np.where(moved, new_x, x)
+        y = np.where(moved, new_y, y)
+        if profiler:
+            profiler.lap('collision')
+
+    pool.x[idx] = x
+    pool.y[idx] = y
+    pool.attack_cooldown[idx] = cooldown
+    pool.state[idx] = state
+
+
+def enemy_attacks(pool, player):
+    """
+    Ready enemies in range attack (the game loop's can_attack/attack pass)
+
+    Includes enemies killed earlier this tick, as the per-object loop does.
+
+    Args:
+        pool: EnemyPool
+        player: Player to attack
+    """
+    idx = pool.indices()
+    if len(idx) < BATCH_THRESHOLD:
+        views = pool.views
+        for i in idx:
+            enemy = views[i]
+            if enemy.can_attack():
+                attack_range = RANGED_RANGE if pool.ranged[i] else MELEE_RANGE
+                if enemy.distance_to(player) <= attack_range:
+                    enemy.attack(player)
+        return
+
+    idx = idx[pool.attack_cooldown[idx] <= 0]
+    if len(idx) == 0:
+        return
+
+    dx = player.x - pool.x[idx]
+    dy = player.y - pool.y[idx]
+    distance = np.sqrt(dx * dx + dy * dy)
+    ranged = pool.ranged[idx]
+
+    # Game loop range check, then perform_attack's own range check
+    strike = ((distance <= np.where(ranged, RANGED_RANGE, MELEE_RANGE))
+              & (distance <= np.where(ranged, 250, 50)))
+    hits = idx[strike]
+    pool.attack_cooldown[hits] = 1.0
+    _hit_player(player, pool.damage[hits])
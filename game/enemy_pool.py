@@ -0,0 +1,307 @@
+"""
+Structure-of-arrays enemy storage
+EnemyPool keeps every enemy's state in typed NumPy arrays with a free-list
+for spawns and deaths, and is the one registry of live enemies.
+EnemyView/BossView give code that still wants enemy.x or enemy.draw() an
+Enemy-compatible object over one slot. Views of a released slot are inert.
+"""
+
+import numpy as np
+from config import *
+from game.enemies import Enemy, Boss
+
+# Type ids: regular enemies first, then bosses
+ENEMY_TYPES = list(ENEMIES) + list(BOSSES)
+TYPE_IDS = {name: i for i, name in enumerate(ENEMY_TYPES)}
+
+STATES = ['idle', 'chase', 'attack', 'retreat']
+STATE_IDS = {name: i for i, name in enumerate(STATES)}
+
+# Per-type stat tables
+_TYPE_DATA = [ENEMIES.get(name) or BOSSES[name] for name in ENEMY_TYPES]
+TYPE_HP = np.array([data['hp'] for data in _TYPE_DATA], dtype=np.float64)
+TYPE_DAMAGE = np.array([data['damage'] for data in _TYPE_DATA], dtype=np.float64)
+TYPE_SPEED = np.array([data['speed'] for data in _TYPE_DATA], dtype=np.float64)
+TYPE_RANGED = np.array([data['attack_type'] == 'ranged' for data in _TYPE_DATA])
+TYPE_BOSS = np.array([name in BOSSES for name in ENEMY_TYPES])
+TYPE_COLORS = [data['color'] for data in _TYPE_DATA]
+
+
+class EnemyPool:
+    """Typed-array storage for all enemies in an arena"""
+
+    def __init__(self, capacity=32):
+        """
+        Initialize pool
+
+        Args:
+            capacity: Initial number of slots (grows automatically)
+        """
+        self.capacity = 0
+        self.count = 0  # Slots in use
+        self.free = []  # Free slot indices (stack)
+        self.views = []  # Current view per slot (None when free)
+        self._indices = None  # Cached indices(), rebuilt after spawn/release
+
+        # Columns
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+        self.hp = np.zeros(0)
+        self.max_hp = np.zeros(0)
+        self.damage = np.zeros(0)
+        self.speed = np.zeros(0)
+        self.attack_cooldown = np.zeros(0)
+        self.width = np.zeros(0, dtype=np.int32)
+        self.height = np.zeros(0, dtype=np.int32)
+        self.type_id = np.zeros(0, dtype=np.int8)
+        self.state = np.zeros(0, dtype=np.int8)
+        self.ranged = np.zeros(0, dtype=bool)
+        self.alive = np.zeros(0, dtype=bool)
+        self.used = np.zeros(0, dtype=bool)
+        self.generation = np.zeros(0, dtype=np.uint32)
+
+        # Boss columns
+        self.heavy_attack_cooldown = np.zeros(0)
+        self.heavy_attack_charge = np.zeros(0)
+        self.charging_heavy = np.zeros(0, dtype=bool)
+
+        self.grow(capacity)
+
+    def grow(self, capacity):
+        """
+        Enlarge every column to at least `capacity` slots
+
+        Args:
+            capacity: New minimum slot count
+        """
+        if capacity <= self.capacity:
+            return
+
+        for name in ('x', 'y', 'hp', 'max_hp', 'damage', 'speed', 'attack_cooldown',
+                     'width', 'height', 'type_id', 'state', 'ranged', 'alive', 'used',
+                     'generation', 'heavy_attack_cooldown', 'heavy_attack_charge',
+                     'charging_heavy'):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.capacity] = old
+            setattr(self, name, new)
+
+        # Hand out low slots first
+        self.free.extend(range(capacity - 1, self.capacity - 1, -1))
+        self.views.extend([None] * (capacity - self.capacity))
+        self.capacity = capacity
+
+    def spawn(self, x, y, enemy_type):
+        """
+        Add an enemy (same signature as Enemy, so it can be a WaveSpawner enemy_class)
+
+        Args:
+            x: Starting x position
+            y: Starting y position
+            enemy_type: Key in ENEMIES or BOSSES
+
+        Returns:
+            EnemyView or BossView for the new enemy
+        """
+        if not self.free:
+            self.grow(self.capacity * 2)
+        i = self.free.pop()
+        type_id = TYPE_IDS[enemy_type]
+        is_boss = TYPE_BOSS[type_id]
+        size = SPRITE_SIZE * 2 if is_boss else SPRITE_SIZE
+
+        self.x[i] = x
+        self.y[i] = y
+        self.hp[i] = TYPE_HP[type_id]
+        self.max_hp[i] = TYPE_HP[type_id]
+        self.damage[i] = TYPE_DAMAGE[type_id]
+        self.speed[i] = TYPE_SPEED[type_id]
+        self.attack_cooldown[i] = 0
+        self.width[i] = size
+        self.height[i] = size
+        self.type_id[i] = type_id
+        self.state[i] = STATE_IDS['idle']
+        self.ranged[i] = TYPE_RANGED[type_id]
+        self.alive[i] = True
+        self.used[i] = True
+        self.heavy_attack_cooldown[i] = 0
+        self.heavy_attack_charge[i] = 0
+        self.charging_heavy[i] = False
+        self.count += 1
+        self._indices = None
+
+        view = (BossView if is_boss else EnemyView)(self, i)
+        self.views[i] = view
+        return view
+
+    def spawn_boss(self, x, y, boss_type='dark_knight'):
+        """Add a boss (same signature as Boss)"""
+        return self.spawn(x, y, boss_type)
+
+    def release(self, index):
+        """
+        Free a slot (dead or despawned enemy); old views report not alive
+
+        Args:
+            index: Slot index
+        """
+        if not self.used[index]:
+            return
+        self.used[index] = False
+        self.alive[index] = False
+        self.generation[index] += 1
+        self.views[index] = None
+        self.free.append(index)
+        self.count -= 1
+        self._indices = None
+
+    def release_many(self, indices):
+        """
+        Free many slots at once (e.g. everything killed this tick)
+
+        Same result as release() on each index in order, without a Python
+        loop over the columns.
+
+        Args:
+            indices: Slot indices, ascending
+        """
+        indices = indices[self.used[indices]]
+        if len(indices) == 0:
+            return
+        self.used[indices] = False
+        self.alive[indices] = False
+        self.generation[indices] += 1
+        released = indices.tolist()
+        views = self.views
+        for i in released:
+            views[i] = None
+        self.free.extend(released)
+        self.count -= len(released)
+        self._indices = None
+
+    def clear(self):
+        """Release every enemy"""
+        self.release_many(self.indices())
+
+    def indices(self):
+        """Slot indices in use, ascending (do not modify the returned array)"""
+        if self._indices is None:
+            self._indices = self.used.nonzero()[0]
+        return self._indices
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        views = self.views
+        return iter([views[i] for i in self.indices()])
+
+
+def _column(name):
+    """Property that reads/writes one pool column at the view's slot"""
+    def get(self):
+        return getattr(self.pool, name)[self.index]
+
+    def set(self, value):
+        if self.current:  # A stale view must not edit whoever reuses the slot
+            getattr(self.pool, name)[self.index] = value
+
+    return property(get, set)
+
+
+class EnemyView:
+    """Enemy-compatible handle onto one EnemyPool slot"""
+
+    __slots__ = ('pool', 'index', 'generation', 'target')
+
+    def __init__(self, pool, index):
+        """
+        Initialize view
+
+        Args:
+            pool: Owning EnemyPool
+            index: Slot index
+        """
+        self.pool = pool
+        self.index = index
+        self.generation = pool.generation[index]
+        self.target = None
+
+    x = _column('x')
+    y = _column('y')
+    hp = _column('hp')
+    max_hp = _column('max_hp')
+    damage = _column('damage')
+    speed = _column('speed')
+    attack_cooldown = _column('attack_cooldown')
+    width = _column('width')
+    height = _column('height')
+
+    @property
+    def current(self):
+        """False once the slot has been released (and maybe reused)"""
+        return self.pool.generation[self.index] == self.generation
+
+    @property
+    def alive(self):
+        return self.current and bool(self.pool.alive[self.index])
+
+    @alive.setter
+    def alive(self, value):
+        if self.current:
+            self.pool.alive[self.index] = value
+
+    @property
+    def state(self):
+        return STATES[self.pool.state[self.index]]
+
+    @state.setter
+    def state(self, value):
+        if self.current:
+            self.pool.state[self.index] = STATE_IDS[value]
+
+    @property
+    def enemy_type(self):
+        return ENEMY_TYPES[self.pool.type_id[self.index]]
+
+    @property
+    def attack_type(self):
+        return 'ranged' if self.pool.ranged[self.index] else 'melee'
+
+    @property
+    def color(self):
+        return TYPE_COLORS[self.pool.type_id[self.index]]
+
+    @property
+    def is_boss(self):
+        return bool(TYPE_BOSS[self.pool.type_id[self.index]])
+
+    # Behaviour is shared with the object-based Enemy
+    update = Enemy.update
+    distance_to = Enemy.distance_to
+    move_toward = Enemy.move_toward
+    move_away = Enemy.move_away
+    perform_attack = Enemy.perform_attack
+    can_attack = Enemy.can_attack
+    attack = Enemy.attack
+    get_rect = Enemy.get_rect
+    draw = Enemy.draw
+
+    def take_damage(self, damage):
+        """Enemy.take_damage; a stale view takes none"""
+        if self.current:
+            Enemy.take_damage(self, damage)
+
+
+class BossView(EnemyView):
+    """Boss-compatible handle onto one EnemyPool slot"""
+
+    __slots__ = ()
+
+    heavy_attack_cooldown = _column('heavy_attack_cooldown')
+    heavy_attack_charge = _column('heavy_attack_charge')
+    charging_heavy = _column('charging_heavy')
+
+    update = Boss.update
+    perform_heavy_attack = Boss.perform_heavy_attack
+    draw = Boss.draw
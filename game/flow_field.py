@@ -0,0 +1,167 @@
+"""
+Flow-field navigation
+One breadth-first search from the player's cell gives every cell of a room
+the next cell on the shortest walkable path to the player, so any number
+of enemies can look up where to go in O(1). Enemies steer for the next
+cell's corner, which is known to be clear of walls.
+"""
+
+import math
+import numpy as np
+from config import *
+
+# Neighbour offsets (row, col): orthogonal first so they win ties
+NEIGHBOURS = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
+
+
+class FlowField:
+    """Shared direction field over a room's collision grid"""
+
+    def __init__(self, room, cell_size=TILE_SIZE // 2, entity_size=SPRITE_SIZE):
+        """
+        Initialize flow field (computed lazily on the first update())
+
+        Args:
+            room: Room whose walls block movement
+            cell_size: Grid cell edge in pixels
+            entity_size: Size of the entities that navigate with it
+        """
+        self.room = room
+        self.cell_size = cell_size
+        self.entity_size = entity_size
+        self.cols = math.ceil(room.width / cell_size)
+        self.rows = math.ceil(room.height / cell_size)
+
+        self.walkable = None  # Cells whose top-left corner an entity can stand on
+        self.distance = None  # Path length in cells to the target cell
+        self.next_x = np.zeros((self.rows, self.cols))  # Screen position to head for
+        self.next_y = np.zeros((self.rows, self.cols))
+        self.has_next = np.zeros((self.rows, self.cols), dtype=bool)
+        self.target_cell = None
+        self._walls = -1  # Wall count the walkable grid was built for
+
+    def cell(self, x, y):
+        """Grid (row, col) containing a screen position (clamped to the grid)"""
+        col = min(max(int((x - self.room.x) // self.cell_size), 0), self.cols - 1)
+        row = min(max(int((y - self.room.y) // self.cell_size), 0), self.rows - 1)
+        return row, col
+
+    def update(self, target_x, target_y):
+        """
+        Point the field at a target, recomputing only if its cell changed
+
+        Args:
+            target_x: Target screen x (entity top-left, like enemy positions)
+            target_y: Target screen y
+        """
+        if self._walls != len(self.room.walls):
+            self._build_walkable()
+        elif self.cell(target_x, target_y) == self.target_cell:
+            return
+
+        self.target_cell = self.cell(target_x, target_y)
+        self._build_distance()
+        self._build_directions()
+
+    def steer(self, x, y, step_x, step_y, speed):
+        """
+        Movement for one tick from a screen position
+
+        Args:
+            x: Entity x
+            y: Entity y
+            step_x: Straight-line step toward the target
+            step_y: Straight-line step toward the target
+            speed: Distance moved per tick
+
+        Returns:
+            tuple: Step toward the next cell's corner (landing on it when
+                within reach), or the straight-line step in the target's
+                cell or with no path
+        """
+        row, col = self.cell(x, y)
+        if not self.has_next.item(row, col):
+            return step_x, step_y
+        dx = self.next_x.item(row, col) - x
+        dy = self.next_y.item(row, col) - y
+        distance = math.sqrt(dx * dx + dy * dy)
+        if distance <= speed:
+            return dx, dy
+        return dx / distance * speed, dy / distance * speed
+
+    def steer_many(self, x, y, step_x, step_y, speed):
+        """steer() for arrays of positions, straight-line steps and speeds"""
+        col = ((x - self.room.x) // self.cell_size).astype(np.intp)
+        row = ((y - self.room.y) // self.cell_size).astype(np.intp)
+        np.clip(col, 0, self.cols - 1, out=col)
+        np.clip(row, 0, self.rows - 1, out=row)
+        flow = self.has_next[row, col]
+        if not flow.any():
+            return step_x, step_y
+
+        dx = self.next_x[row, col] - x
+        dy = self.next_y[row, col] - y
+        distance = np.sqrt(dx * dx + dy * dy)
+        far = distance > speed
+        distance[~far] = 1.0
+        dx = np.where(far, dx / distance * speed, dx)
+        dy = np.where(far, dy / distance * speed, dy)
+        return np.where(flow, dx, step_x), np.where(flow, dy, step_y)
+
+    def _build_walkable(self):
+        """Mark cells where an entity at the cell's corner is clear of walls"""
+        size = self.cell_size
+        col_x = self.room.x + np.arange(self.cols) * size
+        row_y = self.room.y + np.arange(self.rows) * size
+        x, y = np.meshgrid(col_x, row_y)
+        self.walkable = ~self.room.collides(x, y, self.entity_size, self.entity_size)
+        self._walls = len(self.room.walls)
+
+    def _build_distance(self):
+        """Breadth-first wavefront from the target cell over walkable cells"""
+        walkable = self.walkable
+        distance = np.full((self.rows, self.cols), np.inf)
+        frontier = np.zeros((self.rows, self.cols), dtype=bool)
+        frontier[self.target_cell] = True
+        distance[self.target_cell] = 0
+
+        step = 0
+        while frontier.any():
+            step += 1
+            grown = np.zeros_like(frontier)
+            grown[1:] |= frontier[:-1]
+            grown[:-1] |= frontier[1:]
+            grown[:, 1:] |= frontier[:, :-1]
+            grown[:, :-1] |= frontier[:, 1:]
+            frontier = grown & walkable & (distance == np.inf)
+            distance[frontier] = step
+
+        self.distance = distance
+
+    def _build_directions(self):
+        """Point each cell at its neighbour closest to the target"""
+        rows, cols = self.rows, self.cols
+        distance = np.full((rows + 2, cols + 2), np.inf)
+        distance[1:-1, 1:-1] = self.distance
+        walkable = np.zeros((rows + 2, cols + 2), dtype=bool)
+        walkable[1:-1, 1:-1] = self.walkable
+
+        cell_row, cell_col = np.indices((rows, cols))
+        row = cell_row.copy()
+        col = cell_col.copy()
+        best = self.distance.copy()
+        for dr, dc in NEIGHBOURS:
+            neighbour = distance[1 + dr:rows + 1 + dr, 1 + dc:cols + 1 + dc]
+            if dr and dc:
+                # No cutting corners past a blocked orthogonal cell
+                open_corner = (walkable[1 + dr:rows + 1 + dr, 1:-1]
+                               & walkable[1:-1, 1 + dc:cols + 1 + dc])
+                neighbour = np.where(open_corner, neighbour, np.inf)
+            better = neighbour < best
+            best[better] = neighbour[better]
+            row[better] = cell_row[better] + dr
+            col[better] = cell_col[better] + dc
+
+        self.next_x = self.room.x + col * float(self.cell_size)
+        self.next_y = self.room.y + row * float(self.cell_size)
+        self.has_next = best < self.distance  # False in the target cell and without a path
@@ -0,0 +1,78 @@
+"""
+Render-side interpolation between simulation ticks
+The simulation advances in fixed ticks while frames are drawn whenever the
+display is ready, so a frame usually falls between two ticks. Interpolator
+keeps the positions from before the latest tick and blends them with the
+current ones, which keeps motion smooth when the tick and frame rates
+differ. Only drawing uses the blended positions; the simulation is untouched.
+"""
+
+import numpy as np
+
+
+class Interpolator:
+    """Previous-tick positions of the player and every pool enemy"""
+
+    def __init__(self):
+        """Initialize with nothing saved (frames draw current positions)"""
+        self.valid = False
+        self.player_x = 0.0
+        self.player_y = 0.0
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+        self.generation = np.zeros(0, dtype=np.uint32)
+        self.used = np.zeros(0, dtype=bool)
+
+    def reset(self):
+        """Forget saved positions (after a teleport, e.g. a new floor)"""
+        self.valid = False
+
+    def save(self, sim):
+        """Remember positions before a tick"""
+        pool = sim.enemies
+        if len(self.x) != pool.capacity:
+            self.x = pool.x.copy()
+            self.y = pool.y.copy()
+            self.generation = pool.generation.copy()
+            self.used = pool.used.copy()
+        else:
+            np.copyto(self.x, pool.x)
+            np.copyto(self.y, pool.y)
+            np.copyto(self.generation, pool.generation)
+            np.copyto(self.used, pool.used)
+        self.player_x = sim.player.x
+        self.player_y = sim.player.y
+        self.valid = True
+
+    def positions(self, sim, alpha):
+        """
+        Blended positions for drawing
+
+        Enemies that spawned since the save are drawn where they are.
+
+        Args:
+            sim: Simulation after the latest tick
+            alpha: Fraction of a tick elapsed since then (0 draws the
+                previous tick, 1 the latest)
+
+        Returns:
+            tuple: (player x, player y, enemy x, enemy y) with enemy arrays
+                in pool.indices() order
+        """
+        pool = sim.enemies
+        indices = pool.indices()
+        x = pool.x[indices]
+        y = pool.y[indices]
+        player = sim.player
+        if not self.valid or alpha >= 1.0:
+            return player.x, player.y, x, y
+
+        player_x = self.player_x + (player.x - self.player_x) * alpha
+        player_y = self.player_y + (player.y - self.player_y) * alpha
+        if len(self.x) == pool.capacity and len(indices):
+            same = self.used[indices] & (self.generation[indices] == pool.generation[indices])
+            previous_x = self.x[indices]
+            previous_y = self.y[indices]
+            x = np.where(same, previous_x + (x - previous_x) * alpha, x)
+            y = np.where(same, previous_y + (y - previous_y) * alpha, y)
+        return player_x, player_y, x, y
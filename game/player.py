@@ -7,6 +7,14 @@ import pygame
 from config import *
 from game.character import RACES, CLASSES, WEAPONS, ARMORS, can_equip_weapon, can_equip_armor
 
+# Different colors based on class
+CLASS_COLORS = {
+    'warrior': (100, 100, 255),  # Blue
+    'rogue': (100, 255, 100),    # Green
+    'mage': (200, 100, 255),     # Purple
+    'paladin': (255, 215, 0)     # Gold
+}
+
 class Player:
     """Player character with race/class system"""
     
@@ -267,14 +275,7 @@ class Player:
         Args:
             surface: pygame Surface to draw on
         """
-        # Different colors based on class
-        class_colors = {
-            'warrior': (100, 100, 255),  # Blue
-            'rogue': (100, 255, 100),    # Green
-            'mage': (200, 100, 255),     # Purple
-            'paladin': (255, 215, 0)     # Gold
-        }
-        self.color = class_colors.get(self.character_class, BLUE)
+        self.color = CLASS_COLORS.get(self.character_class, BLUE)
         
         # Simple colored rectangle
         pygame.draw.rect(surface, self.color, self.get_rect())
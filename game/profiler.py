@@ -0,0 +1,120 @@
+"""
+Per-phase frame timing
+Code marks the end of each phase with lap(scope), which charges the time
+since the previous mark to that scope; a frame's laps are summed, kept in a
+rolling window for percentiles and optionally written to a trace file.
+
+Callers hold the profiler in an attribute that is None when profiling is
+off and guard every call with `if profiler:`, so a disabled profiler costs
+one attribute check per phase.
+"""
+
+import time
+import numpy as np
+
+# Timing scopes, in frame order. Simulation.step times player (potion,
+# movement, arena bounds, attack), enemy_ai (states, steering), collision
+# (enemy wall checks, batched path only), enemy_attacks, cleanup (dead
+# enemy removal), items (pickups, timers) and checks (wave/death).
+SCOPES = ('input', 'agent', 'spawner', 'player', 'enemy_ai', 'collision', 'enemy_attacks',
+          'cleanup', 'items', 'checks', 'ui_panels', 'arena_draw', 'flip')
+
+
+class FrameProfiler:
+    """Named timing scopes summed per frame"""
+
+    def __init__(self, window=300, trace_path=None, scopes=SCOPES):
+        """
+        Initialize profiler
+
+        Args:
+            window: Frames kept for percentiles
+            trace_path: Write one CSV row of nanoseconds per frame to this
+                file (optional)
+            scopes: Scope names
+        """
+        self.scopes = scopes
+        self.index = {name: i for i, name in enumerate(scopes)}
+        self.window = window
+        self.current = [0] * len(scopes)  # Nanoseconds per scope in the open frame
+        self.history = np.zeros((window, len(scopes) + 1), dtype=np.int64)  # Last column: frame total
+        self.totals = [0] * (len(scopes) + 1)  # Nanoseconds since creation
+        self.frames = 0
+        self.frame_start = 0
+        self.last = 0
+
+        self.trace = None
+        if trace_path:
+            self.trace = open(trace_path, 'w')
+            self.trace.write('frame,' + ','.join(f'{name}_ns' for name in scopes) + ',frame_ns\n')
+
+    def start_frame(self):
+        """Open a frame (time before this is not counted)"""
+        now = time.perf_counter_ns()
+        self.frame_start = now
+        self.last = now
+        current = self.current
+        for i in range(len(current)):
+            current[i] = 0
+
+    def mark(self):
+        """Start the next lap without charging the time since the last one"""
+        self.last = time.perf_counter_ns()
+
+    def lap(self, scope):
+        """Charge the time since the last mark or lap to a scope"""
+        now = time.perf_counter_ns()
+        self.current[self.index[scope]] += now - self.last
+        self.last = now
+
+    def end_frame(self):
+        """Close the frame and record it"""
+        total = time.perf_counter_ns() - self.frame_start
+        current = self.current
+        row = self.history[self.frames % self.window]
+        row[:-1] = current
+        row[-1] = total
+
+        totals = self.totals
+        for i, ns in enumerate(current):
+            totals[i] += ns
+        totals[-1] += total
+
+        if self.trace:
+            self.trace.write(f"{self.frames},{','.join(map(str, current))},{total}\n")
+        self.frames += 1
+
+    def percentiles(self, q=(50, 99)):
+        """
+        Rolling percentiles over the last `window` frames
+
+        Args:
+            q: Percentiles to compute
+
+        Returns:
+            dict: Scope name (plus 'frame') -> milliseconds per percentile
+        """
+        rows = self.history[:min(self.frames, self.window)]
+        names = self.scopes + ('frame',)
+        if len(rows) == 0:
+            return {name: tuple(0.0 for _ in q) for name in names}
+        values = np.percentile(rows, q, axis=0) / 1e6
+        return {name: tuple(values[:, i].tolist()) for i, name in enumerate(names)}
+
+    def summary(self):
+        """
+        Mean time per frame by scope since creation
+
+        Returns:
+            dict: Scope name (plus 'frame') -> (mean milliseconds, share of frame time)
+        """
+        frames = max(self.frames, 1)
+        frame_ns = self.totals[-1] or 1
+        names = self.scopes + ('frame',)
+        return {name: (ns / frames / 1e6, ns / frame_ns) for name, ns in zip(names, self.totals)}
+
+    def close(self):
+        """Flush and close the trace file"""
+        if self.trace:
+            self.trace.close()
+            self.trace = None
@@ -0,0 +1,193 @@
+"""
+Input recording and deterministic replay
+A recording is the episode seed plus one byte per input event: a packed
+Action for each simulation tick, or an "advance" byte where the player
+left a wave/floor complete screen. Replaying re-runs the Simulation
+headlessly from the same seed, so it ends in exactly the same state.
+
+File layout (little-endian):
+    magic b'ADRP', version u8, race and class (u8 length + ASCII),
+    seed (16 bytes unsigned), tick rate u16,
+    event count u32, one byte per event
+"""
+
+import struct
+import time
+from config import *
+from game.simulation import Simulation, Action
+
+MAGIC = b'ADRP'
+VERSION = 2
+
+# Event bits
+UP = 1
+DOWN = 2
+LEFT = 4
+RIGHT = 8
+ATTACK = 16
+POTION = 32
+ADVANCE = 64  # Leave the wave/floor complete screen (no tick)
+
+
+def pack_action(action):
+    """Pack an Action into one event byte"""
+    bits = 0
+    if action.move_y < 0:
+        bits |= UP
+    elif action.move_y > 0:
+        bits |= DOWN
+    if action.move_x < 0:
+        bits |= LEFT
+    elif action.move_x > 0:
+        bits |= RIGHT
+    if action.attack:
+        bits |= ATTACK
+    if action.use_potion:
+        bits |= POTION
+    return bits
+
+
+def unpack_action(bits):
+    """Build the Action an event byte describes"""
+    move_x = -1 if bits & LEFT else 1 if bits & RIGHT else 0
+    move_y = -1 if bits & UP else 1 if bits & DOWN else 0
+    return Action(move_x, move_y, bool(bits & ATTACK), bool(bits & POTION))
+
+
+# Decoded once so replays allocate nothing per tick
+ACTIONS_BY_BITS = [unpack_action(bits) for bits in range(ADVANCE)]
+
+
+class InputRecorder:
+    """Collects a session's input events for saving"""
+
+    def __init__(self, race, character_class, seed, tick_rate=SIM_RATE):
+        """
+        Initialize recorder
+
+        Args:
+            race: Player race
+            character_class: Player class
+            seed: Episode seed the Simulation was reset with
+            tick_rate: Simulation ticks per second
+        """
+        self.race = race
+        self.character_class = character_class
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.events = bytearray()
+
+    def record(self, action):
+        """Record the Action for one simulation tick"""
+        self.events.append(pack_action(action))
+
+    def record_advance(self):
+        """Record leaving a wave/floor complete screen"""
+        self.events.append(ADVANCE)
+
+    def save(self, path):
+        """Write the recording to a file"""
+        save_replay(path, self.race, self.character_class, self.seed, self.events, self.tick_rate)
+
+
+def save_replay(path, race, character_class, seed, events, tick_rate=SIM_RATE):
+    """
+    Write a recording file
+
+    Args:
+        path: Output file path
+        race: Player race
+        character_class: Player class
+        seed: Episode seed (non-negative, up to 128 bits)
+        events: Event bytes
+        tick_rate: Simulation ticks per second
+    """
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<B', VERSION))
+        for name in (race, character_class):
+            data = name.encode('ascii')
+            f.write(struct.pack('<B', len(data)))
+            f.write(data)
+        f.write(seed.to_bytes(16, 'little'))
+        f.write(struct.pack('<HI', tick_rate, len(events)))
+        f.write(bytes(events))
+
+
+def load_replay(path):
+    """
+    Read a recording file
+
+    Args:
+        path: Recording file path
+
+    Returns:
+        InputRecorder: Recording with race, class, seed, tick rate and events
+
+    Raises:
+        ValueError: If the file is not a recording or has another version
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    if data[:4] != MAGIC:
+        raise ValueError(f"{path} is not a replay file")
+    version = data[4]
+    if version != VERSION:
+        raise ValueError(f"{path} has unsupported replay version {version}")
+
+    offset = 5
+    names = []
+    for _ in range(2):
+        length = data[offset]
+        names.append(data[offset + 1:offset + 1 + length].decode('ascii'))
+        offset += 1 + length
+    seed = int.from_bytes(data[offset:offset + 16], 'little')
+    offset += 16
+    tick_rate, count = struct.unpack_from('<HI', data, offset)
+    offset += 6
+
+    recording = InputRecorder(names[0], names[1], seed, tick_rate)
+    recording.events = bytearray(data[offset:offset + count])
+    return recording
+
+
+def run_replay(recording):
+    """
+    Re-run a recording headlessly as fast as possible
+
+    Args:
+        recording: InputRecorder (e.g. from load_replay)
+
+    Returns:
+        Simulation: Final state of the replayed session
+    """
+    sim = Simulation(race=recording.race, character_class=recording.character_class,
+                     dt=1.0 / recording.tick_rate)
+    sim.reset(seed=recording.seed)
+    actions = ACTIONS_BY_BITS
+
+    for bits in recording.events:
+        if bits & ADVANCE:
+            if sim.state == 'wave_complete':
+                sim.next_wave()
+            elif sim.state == 'floor_complete':
+                sim.next_floor()
+        else:
+            sim.step(actions[bits])
+
+    return sim
+
+
+def replay_file(path):
+    """Replay a recording file and print how it ended"""
+    recording = load_replay(path)
+    start = time.perf_counter()
+    sim = run_replay(recording)
+    elapsed = time.perf_counter() - start
+
+    print(f"{recording.race} {recording.character_class}, seed {recording.seed}")
+    print(f"Result: {sim.state} on floor {sim.current_floor}, wave {sim.current_wave}")
+    print(f"Player HP {int(sim.player.hp)}/{sim.player.max_hp}, time survived {sim.time_survived:.1f}s")
+    print(f"{sim.tick_count:,} ticks in {elapsed:.3f}s ({sim.tick_count / max(elapsed, 1e-9):,.0f} ticks/s)")
+    return sim
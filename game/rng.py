@@ -0,0 +1,65 @@
+"""
+Seeded random streams
+An RngContext holds one independent stream per purpose (enemy types,
+spawn positions, loot), all derived from a single episode seed, so a run
+can be reproduced exactly and drawing more from one stream never shifts
+the others. Draws are pre-generated in batches with a NumPy Generator.
+"""
+
+import numpy as np
+
+STREAMS = ('spawn_types', 'spawn_positions', 'loot')
+
+
+class RandomStream:
+    """One random stream with a random-module style interface"""
+
+    def __init__(self, seed_sequence, batch_size=256):
+        """
+        Initialize stream
+
+        Args:
+            seed_sequence: numpy SeedSequence for this stream
+            batch_size: Draws generated per refill
+        """
+        self.generator = np.random.Generator(np.random.PCG64(seed_sequence))
+        self.batch_size = batch_size
+        self.buffer = np.zeros(batch_size)
+        self.position = batch_size  # Buffer starts used up
+
+    def random(self):
+        """Float in [0, 1)"""
+        if self.position >= self.batch_size:
+            self.generator.random(out=self.buffer)
+            self.position = 0
+        value = self.buffer.item(self.position)
+        self.position += 1
+        return value
+
+    def randint(self, a, b):
+        """Integer in [a, b], both inclusive"""
+        return a + int(self.random() * (b - a + 1))
+
+    def choice(self, seq):
+        """Random element of a non-empty sequence"""
+        return seq[int(self.random() * len(seq))]
+
+
+class RngContext:
+    """Per-episode set of independent random streams"""
+
+    def __init__(self, seed=None):
+        """
+        Initialize streams
+
+        Args:
+            seed: Episode seed (None draws fresh entropy; the value used is
+                kept in self.seed so the episode can be replayed)
+        """
+        sequence = np.random.SeedSequence(seed)
+        self.seed = sequence.entropy
+        children = sequence.spawn(len(STREAMS))
+
+        self.spawn_types = RandomStream(children[0])
+        self.spawn_positions = RandomStream(children[1])
+        self.loot = RandomStream(children[2])
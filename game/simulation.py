@@ -0,0 +1,342 @@
+"""
+Headless arena simulation
+Advances player, waves, enemies and items by a fixed timestep.
+No display or event handling - main.Game and the AI environments drive it.
+"""
+
+import numpy as np
+from config import *
+from game.player import Player
+from game.enemy_pool import EnemyPool
+from game.enemy_kernel import update_enemies, enemy_attacks
+from game.dungeon import Room
+from game.items import HealthPotion
+from game.wave_spawner import WaveSpawner
+from game.rng import RngContext
+from game.snapshot import SimulationSnapshot
+
+
+class Action:
+    """Player input for a single simulation tick"""
+
+    __slots__ = ('move_x', 'move_y', 'attack', 'use_potion')
+
+    def __init__(self, move_x=0, move_y=0, attack=False, use_potion=False):
+        """
+        Initialize action
+
+        Args:
+            move_x: Horizontal direction (-1 left, 0 none, 1 right)
+            move_y: Vertical direction (-1 up, 0 none, 1 down)
+            attack: True to attack this tick
+            use_potion: True to drink a health potion this tick
+        """
+        self.move_x = move_x
+        self.move_y = move_y
+        self.attack = attack
+        self.use_potion = use_potion
+
+
+class Simulation:
+    """Arena game state advanced one fixed tick at a time"""
+
+    def __init__(self, race='human', character_class='warrior', dt=SIM_DT):
+        """
+        Initialize simulation (call reset() before stepping)
+
+        Args:
+            race: Player race
+            character_class: Player class
+            dt: Fixed timestep in seconds
+        """
+        self.race = race
+        self.character_class = character_class
+        self.dt = dt
+
+        # Game objects
+        self.rng = None  # RngContext for the current episode
+        self.player = None
+        self.room = None
+        self.wave_spawner = None
+        self.enemies = EnemyPool()
+        self.items = []
+
+        # Progress
+        self.state = 'playing'  # playing, wave_complete, floor_complete, game_over, victory
+        self.current_floor = 1
+        self.current_wave = 1
+        self.max_floor = FLOORS
+        self.time_survived = 0
+        self.tick_count = 0
+
+        # Messages
+        self.pickup_message = ""
+        self.pickup_timer = 0
+
+        # Per-tick results (overwritten every step)
+        self.damage_dealt = 0
+        self.damage_taken = 0
+        self.kills = 0
+
+        # FrameProfiler timing the step phases (None when off)
+        self.profiler = None
+
+    def reset(self, seed=None):
+        """
+        Create a fresh player and start floor 1
+
+        Args:
+            seed: Episode seed for spawns and loot (None for a fresh one,
+                available afterwards as self.rng.seed)
+        """
+        self.rng = RngContext(seed)
+        self.player = Player(
+            ARENA_X + PLAYER_SPAWN_X,
+            ARENA_Y + PLAYER_SPAWN_Y,
+            race=self.race,
+            character_class=self.character_class
+        )
+
+        self.current_floor = 1
+        self.current_wave = 1
+        self.time_survived = 0
+        self.tick_count = 0
+        self.pickup_message = ""
+        self.pickup_timer = 0
+
+        self.start_floor()
+
+    def start_floor(self):
+        """Start a new floor"""
+        # Create arena room (just for collision detection)
+        self.room = Room(ARENA_WIDTH, ARENA_HEIGHT, ARENA_X, ARENA_Y)
+
+        # Reset player position
+        self.player.x = ARENA_X + PLAYER_SPAWN_X
+        self.player.y = ARENA_Y + PLAYER_SPAWN_Y
+
+        # Reset enemies
+        self.enemies.clear()
+
+        # Create wave spawner
+        self.wave_spawner = WaveSpawner(
+            self.enemies.spawn,
+            spawn_interval=WAVE_SPAWN_INTERVAL,
+            max_waves=WAVES_PER_FLOOR,
+            rng=self.rng,
+            registry=self.enemies
+        )
+
+        # Start first wave
+        self.wave_spawner.start_wave(self.current_wave, self.current_floor)
+
+        # Spawn some health potions
+        self.spawn_potions()
+
+        self.state = 'playing'
+
+    def spawn_potions(self):
+        """Spawn health potions in arena"""
+        loot = self.rng.loot
+        self.items = []
+
+        num_potions = 2 + self.current_floor // 2  # More potions on later floors
+
+        for _ in range(num_potions):
+            x = ARENA_X + loot.randint(100, ARENA_WIDTH - 100)
+            y = ARENA_Y + loot.randint(100, ARENA_HEIGHT - 100)
+            self.items.append(HealthPotion(x, y))
+
+    def next_wave(self):
+        """Leave the wave complete state"""
+        if self.current_wave < WAVES_PER_FLOOR:
+            # Start next wave
+            self.current_wave += 1
+            self.wave_spawner.start_wave(self.current_wave, self.current_floor)
+            self.state = 'playing'
+        else:
+            # Floor complete
+            self.state = 'floor_complete'
+
+    def next_floor(self):
+        """Leave the floor complete state"""
+        if self.current_floor < self.max_floor:
+            # Next floor
+            self.current_floor += 1
+            self.current_wave = 1
+            self.start_floor()
+        else:
+            # Victory!
+            self.state = 'victory'
+
+    def use_potion(self):
+        """
+        Drink a health potion if it would heal
+
+        Returns:
+            int: HP healed (0 if no potion was used)
+        """
+        if self.player.health_potions > 0 and self.player.hp < self.player.max_hp:
+            heal_amount = min(HEALTH_POTION_HEAL, self.player.max_hp - self.player.hp)
+            self.player.hp += heal_amount
+            self.player.health_potions -= 1
+            self.pickup_message = f"Healed {heal_amount} HP!"
+            self.pickup_timer = 2.0
+            return heal_amount
+        return 0
+
+    def snapshot(self, out=None):
+        """
+        Capture the full state for a later restore()
+
+        Args:
+            out: SimulationSnapshot to reuse (avoids allocating a buffer)
+
+        Returns:
+            SimulationSnapshot: The captured state
+        """
+        snapshot = out or SimulationSnapshot()
+        snapshot.capture(self)
+        return snapshot
+
+    def restore(self, snapshot):
+        """Return to a state captured by snapshot()"""
+        snapshot.restore(self)
+
+    def step(self, action):
+        """
+        Advance the playing state by one tick
+
+        Args:
+            action: Action to apply this tick
+        """
+        self.damage_dealt = 0
+        self.damage_taken = 0
+        self.kills = 0
+
+        if self.state != 'playing':
+            return
+
+        dt = self.dt
+        player = self.player
+        profiler = self.profiler
+        if profiler:
+            profiler.mark()
+        self.tick_count += 1
+
+        if action.use_potion:
+            self.use_potion()
+        hp_start = player.hp
+
+        # Time tracking
+        self.time_survived += dt
+        if profiler:
+            profiler.lap('player')
+
+        # Update wave spawner
+        self.wave_spawner.update(
+            dt,
+            ARENA_X + ENEMY_SPAWN_X,
+            ARENA_Y + ENEMY_SPAWN_Y_MIN,
+            ARENA_Y + ENEMY_SPAWN_Y_MAX
+        )
+        if profiler:
+            profiler.lap('spawner')
+
+        # Move player with arena bounds checking (PLAYER_SPEED is per tick at FPS)
+        step = PLAYER_SPEED * (dt * FPS)
+        player.x += action.move_x * step
+        player.y += action.move_y * step
+
+        # Keep in arena bounds
+        player_rect = player.get_rect()
+        if player_rect.left < ARENA_X:
+            player.x = ARENA_X
+        if player_rect.right > ARENA_X + ARENA_WIDTH:
+            player.x = ARENA_X + ARENA_WIDTH - player_rect.width
+        if player_rect.top < ARENA_Y:
+            player.y = ARENA_Y
+        if player_rect.bottom > ARENA_Y + ARENA_HEIGHT:
+            player.y = ARENA_Y + ARENA_HEIGHT - player_rect.height
+
+        # Update player
+        player.update(dt)
+
+        # Attack
+        if action.attack and player.attack_cooldown <= 0:
+            self.player_attack()
+        if profiler:
+            profiler.lap('player')
+
+        # Update enemies, then ready enemies in range attack
+        pool = self.enemies
+        update_enemies(pool, player, dt, self.room, profiler)
+        if profiler:
+            profiler.lap('enemy_ai')
+        enemy_attacks(pool, player)
+        if profiler:
+            profiler.lap('enemy_attacks')
+
+        # Remove dead enemies (the spawner counts live enemies from the pool)
+        indices = pool.indices()
+        dead = indices[~pool.alive[indices]]
+        if len(dead):
+            pool.release_many(dead)
+            self.kills += len(dead)
+        if profiler:
+            profiler.lap('cleanup')
+
+        # Update items
+        for item in self.items[:]:
+            if item.check_pickup(player):
+                if isinstance(item, HealthPotion):
+                    player.health_potions += 1
+                    self.pickup_message = "Picked up Health Potion!"
+                    self.pickup_timer = 2.0
+                self.items.remove(item)
+
+        # Update timers
+        if self.pickup_timer > 0:
+            self.pickup_timer -= dt
+        if profiler:
+            profiler.lap('items')
+
+        self.damage_taken = hp_start - player.hp
+
+        # Check wave complete
+        if self.wave_spawner.is_wave_complete() and len(self.enemies) == 0:
+            if self.current_wave < WAVES_PER_FLOOR:
+                self.state = 'wave_complete'
+            else:
+                # All waves complete = floor complete
+                self.state = 'floor_complete'
+
+        # Check player death
+        if player.hp <= 0:
+            self.state = 'game_over'
+
+        if profiler:
+            profiler.lap('checks')
+
+    def player_attack(self):
+        """Handle player attacking"""
+        player = self.player
+        player.attack_cooldown = ATTACK_COOLDOWN
+        attack_range = RANGED_RANGE if player.weapon_type == 'ranged' else MELEE_RANGE
+
+        # Find enemies in range
+        pool = self.enemies
+        indices = pool.indices()
+        dx = player.x - pool.x[indices]
+        dy = player.y - pool.y[indices]
+        hit = indices[np.sqrt(dx * dx + dy * dy) <= attack_range]
+        if len(hit) == 0:
+            return
+
+        # Deal damage (Enemy.take_damage for every enemy hit)
+        hp_before = pool.hp[hit].sum()
+        pool.hp[hit] -= player.damage
+        killed = hit[pool.hp[hit] <= 0]
+        pool.hp[killed] = 0
+        pool.alive[killed] = False
+        self.damage_dealt += hp_before - pool.hp[hit].sum()
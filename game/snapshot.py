@@ -0,0 +1,255 @@
+"""
+Snapshot/restore of a whole Simulation
+Captures player, enemy pool, wave spawner, items and RNG streams into one
+flat float64 buffer that is reused between captures, and writes it back
+into the same Simulation objects in place. Used for lookahead rollouts:
+capture once, then restore before every branch.
+
+Integers are stored as float64 (exact below 2**53); the 128-bit RNG
+state words are stored bit-for-bit through a uint64 view of the buffer.
+"""
+
+import numpy as np
+from config import *
+from game.enemy_pool import TYPE_IDS, TYPE_BOSS, ENEMY_TYPES, EnemyView, BossView
+from game.items import HealthPotion
+from game.rng import STREAMS
+
+SIM_STATES = ['playing', 'wave_complete', 'floor_complete', 'game_over', 'victory']
+SIM_STATE_IDS = {name: i for i, name in enumerate(SIM_STATES)}
+
+# Pool columns in buffer order
+POOL_COLUMNS = ('x', 'y', 'hp', 'max_hp', 'damage', 'speed', 'attack_cooldown',
+                'width', 'height', 'type_id', 'state', 'ranged', 'alive', 'used',
+                'generation', 'heavy_attack_cooldown', 'heavy_attack_charge',
+                'charging_heavy')
+
+WORD_MASK = (1 << 64) - 1
+
+
+class SimulationSnapshot:
+    """Reusable flat buffer holding one Simulation state"""
+
+    def __init__(self, size=4096):
+        """
+        Initialize snapshot
+
+        Args:
+            size: Initial buffer length in float64 slots (grows on demand)
+        """
+        self.data = np.zeros(size)
+        self.words = self.data.view(np.uint64)
+        self.length = 0  # Slots used by the last capture
+        self.pickup_message = ""  # Display text is immutable, so kept by reference
+
+    def __getstate__(self):
+        """Pickle only the used part of the buffer (e.g. to send to a worker)"""
+        return {'data': self.data[:self.length].copy(), 'pickup_message': self.pickup_message}
+
+    def __setstate__(self, state):
+        """Rebuild from __getstate__()"""
+        self.data = state['data']
+        self.words = self.data.view(np.uint64)
+        self.length = len(self.data)
+        self.pickup_message = state['pickup_message']
+
+    def _reserve(self, size):
+        """Make sure the buffer has at least `size` slots"""
+        if size > len(self.data):
+            data = np.zeros(max(size, len(self.data) * 2))
+            data[:self.length] = self.data[:self.length]
+            self.data = data
+            self.words = data.view(np.uint64)
+
+    def capture(self, sim):
+        """
+        Copy the simulation's state into the buffer
+
+        Args:
+            sim: Simulation to capture
+        """
+        player = sim.player
+        pool = sim.enemies
+        spawner = sim.wave_spawner
+        capacity = pool.capacity
+        queue = spawner.enemies_to_spawn
+        active = spawner.active_enemies
+        items = sim.items
+        batch = sum(getattr(sim.rng, name).batch_size for name in STREAMS)
+
+        self._reserve(40 + 3 * len(queue) + len(active) + 3 * len(items)
+                      + (len(POOL_COLUMNS) + 1) * capacity + len(STREAMS) * 8 + batch)
+        data = self.data
+
+        # Simulation and player
+        data[0:16] = (
+            SIM_STATE_IDS[sim.state], sim.current_floor, sim.current_wave,
+            sim.time_survived, sim.tick_count, sim.pickup_timer,
+            sim.damage_dealt, sim.damage_taken, sim.kills,
+            player.x, player.y, player.hp, player.alive,
+            player.facing == 'left', player.attack_cooldown, player.health_potions
+        )
+
+        # Wave spawner
+        data[16:23] = (
+            spawner.current_wave, spawner.max_waves, spawner.spawn_timer,
+            spawner.wave_active, spawner.all_waves_complete, len(queue), len(active)
+        )
+        i = 23
+        for spawn_time, order, enemy_type in queue:
+            data[i] = spawn_time
+            data[i + 1] = order
+            data[i + 2] = TYPE_IDS[enemy_type]
+            i += 3
+        for enemy in active:
+            data[i] = enemy.index
+            i += 1
+
+        # Items
+        data[i] = len(items)
+        i += 1
+        for item in items:
+            data[i] = item.x
+            data[i + 1] = item.y
+            data[i + 2] = item.active
+            i += 3
+
+        # Enemy pool
+        data[i] = capacity
+        data[i + 1] = len(pool.free)
+        i += 2
+        for name in POOL_COLUMNS:
+            data[i:i + capacity] = getattr(pool, name)
+            i += capacity
+        data[i:i + len(pool.free)] = pool.free
+        i += capacity
+
+        # RNG streams
+        words = self.words
+        for name in STREAMS:
+            stream = getattr(sim.rng, name)
+            state = stream.generator.bit_generator.state
+            pcg = state['state']
+            words[i] = pcg['state'] & WORD_MASK
+            words[i + 1] = pcg['state'] >> 64
+            words[i + 2] = pcg['inc'] & WORD_MASK
+            words[i + 3] = pcg['inc'] >> 64
+            words[i + 4] = state['uinteger']
+            data[i + 5] = state['has_uint32']
+            data[i + 6] = stream.position
+            data[i + 7] = stream.batch_size
+            i += 8
+            data[i:i + stream.batch_size] = stream.buffer
+            i += stream.batch_size
+
+        self.pickup_message = sim.pickup_message
+        self.length = i
+
+    def restore(self, sim):
+        """
+        Write the captured state back into the simulation's objects
+
+        Args:
+            sim: Simulation the snapshot was captured from (or one reset
+                with the same race and class)
+        """
+        player = sim.player
+        pool = sim.enemies
+        spawner = sim.wave_spawner
+        data = self.data
+        values = data[0:23].tolist()
+
+        # Simulation and player
+        sim.state = SIM_STATES[int(values[0])]
+        sim.current_floor = int(values[1])
+        sim.current_wave = int(values[2])
+        sim.time_survived = values[3]
+        sim.tick_count = int(values[4])
+        sim.pickup_timer = values[5]
+        sim.pickup_message = self.pickup_message
+        sim.damage_dealt = values[6]
+        sim.damage_taken = values[7]
+        sim.kills = int(values[8])
+        player.x = values[9]
+        player.y = values[10]
+        player.hp = values[11]
+        player.alive = bool(values[12])
+        player.facing = 'left' if values[13] else 'right'
+        player.attack_cooldown = values[14]
+        player.health_potions = int(values[15])
+
+        # Wave spawner (queue first; active enemies once the pool is back)
+        spawner.current_wave = int(values[16])
+        spawner.max_waves = int(values[17])
+        spawner.spawn_timer = values[18]
+        spawner.wave_active = bool(values[19])
+        spawner.all_waves_complete = bool(values[20])
+        queue_length = int(values[21])
+        active_length = int(values[22])
+        i = 23
+        # Entries keep their captured order, which is still a valid heap
+        queue = data[i:i + 3 * queue_length].tolist()
+        spawner.enemies_to_spawn = [(queue[k], int(queue[k + 1]), ENEMY_TYPES[int(queue[k + 2])])
+                                    for k in range(0, len(queue), 3)]
+        i += 3 * queue_length
+        active = data[i:i + active_length].astype(np.intp)
+        i += active_length
+
+        # Items
+        count = int(data[i])
+        i += 1
+        items = []
+        for x, y, item_active in data[i:i + 3 * count].reshape(count, 3).tolist():
+            item = HealthPotion(x, y)
+            item.active = bool(item_active)
+            items.append(item)
+        sim.items = items
+        i += 3 * count
+
+        # Enemy pool
+        capacity = int(data[i])
+        free_length = int(data[i + 1])
+        i += 2
+        pool.grow(capacity)
+        for name in POOL_COLUMNS:
+            column = getattr(pool, name)
+            column[:capacity] = data[i:i + capacity]
+            column[capacity:] = 0
+            i += capacity
+        pool.free = data[i:i + free_length].astype(np.intp).tolist()
+        pool.free.extend(range(pool.capacity - 1, capacity - 1, -1))
+        i += capacity
+
+        # Views of enemies that existed at capture time are kept; the
+        # generation check replaces views of anything spawned since
+        used = pool.used.nonzero()[0]
+        pool.count = len(used)
+        pool._indices = None
+        old_views = pool.views
+        views = [None] * pool.capacity
+        for slot in used.tolist():
+            view = old_views[slot]
+            if view is None or view.generation != pool.generation[slot]:
+                view = (BossView if TYPE_BOSS[pool.type_id[slot]] else EnemyView)(pool, slot)
+            views[slot] = view
+        pool.views = views
+        spawner.active_enemies = {views[slot] for slot in active.tolist()}
+
+        # RNG streams
+        words = self.words
+        for name in STREAMS:
+            stream = getattr(sim.rng, name)
+            stream.generator.bit_generator.state = {
+                'bit_generator': 'PCG64',
+                'state': {
+                    'state': int(words[i]) | (int(words[i + 1]) << 64),
+                    'inc': int(words[i + 2]) | (int(words[i + 3]) << 64),
+                },
+                'has_uint32': int(data[i + 5]),
+                'uinteger': int(words[i + 4]),
+            }
+            stream.position = int(data[i + 6])
+            batch = int(data[i + 7])
+            i += 8
+            stream.buffer[:] = data[i:i + batch]
+            i += batch
@@ -0,0 +1,151 @@
+"""
+Pre-rendered entity sprites and batched drawing
+Bodies, health bars and potions are rendered once into small Surfaces and
+every frame's entities go to the screen in a single Surface.blits() call
+(fblits() where pygame provides it), instead of several pygame.draw calls
+per entity. Health bars are cached per filled pixel width, so there are at
+most bar width + 1 of them per bar size and the output matches the
+per-entity draw() methods exactly.
+"""
+
+import numpy as np
+import pygame
+from config import *
+from game.enemy_pool import TYPE_BOSS, TYPE_COLORS
+from game.player import CLASS_COLORS
+
+POTION_RADIUS = 10
+BAR_MARGIN = 20  # Highest bar above its sprite (boss heavy-attack charge)
+BOSS_TYPES = TYPE_BOSS.tolist()  # Plain bools are faster to index per enemy
+
+
+class SpriteCache:
+    """Cache of entity Surfaces plus batched draw calls"""
+
+    def __init__(self):
+        """Initialize cache (sprites are rendered on first use)"""
+        self.surfaces = {}
+        self.batch = []  # (Surface, position) pairs for the next blit call
+        self._fblits = getattr(pygame.Surface, 'fblits', None)  # pygame-ce only
+
+    def rect(self, color, width, height):
+        """Solid rectangle sprite"""
+        key = ('rect', color, width, height)
+        sprite = self.surfaces.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((width, height))
+            sprite.fill(color)
+            self.surfaces[key] = sprite
+        return sprite
+
+    def health_bar(self, width, height, filled):
+        """Red bar of the given size with `filled` pixels of green"""
+        key = ('bar', width, height, filled)
+        sprite = self.surfaces.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((width, height))
+            sprite.fill(RED)
+            sprite.fill(GREEN, (0, 0, filled, height))
+            self.surfaces[key] = sprite
+        return sprite
+
+    def potion(self, color):
+        """Potion sprite (transparent around the circle)"""
+        key = ('potion', color)
+        sprite = self.surfaces.get(key)
+        if sprite is None:
+            size = POTION_RADIUS * 2 + 2
+            sprite = pygame.Surface((size, size))
+            sprite.fill(BLACK)
+            sprite.set_colorkey(BLACK)
+            center = (POTION_RADIUS + 1, POTION_RADIUS + 1)
+            pygame.draw.circle(sprite, color, center, POTION_RADIUS)
+            pygame.draw.circle(sprite, WHITE, center, POTION_RADIUS, 2)
+            self.surfaces[key] = sprite
+        return sprite
+
+    def draw(self, surface, items, player, enemies, positions=None):
+        """
+        Draw items, then the player, then every enemy, in one blit call
+
+        Args:
+            surface: Target surface
+            items: Item list
+            player: Player
+            enemies: EnemyPool
+            positions: (player x, player y, enemy x, enemy y) to draw at
+                instead of the current ones (see Interpolator.positions)
+        """
+        if positions is None:
+            positions = (player.x, player.y, None, None)
+        self.queue_items(items)
+        self.queue_player(player, positions[0], positions[1])
+        self.queue_enemies(enemies, positions[2], positions[3])
+        self.flush(surface)
+
+    def queue_items(self, items):
+        """Queue every active item (HealthPotion.draw)"""
+        offset = POTION_RADIUS + 1
+        for item in items:
+            if item.active:
+                center_x = int(item.x + item.width // 2)
+                center_y = int(item.y + item.height // 2)
+                self.batch.append((self.potion(item.color), (center_x - offset, center_y - offset)))
+
+    def queue_player(self, player, x, y):
+        """Queue the player (Player.draw) at a position"""
+        x = int(x)
+        y = int(y)
+        width = player.width
+        filled = int((player.hp / player.max_hp) * width)
+        self.batch.append((self.rect(CLASS_COLORS.get(player.character_class, BLUE),
+                                     width, player.height), (x, y)))
+        self.batch.append((self.health_bar(width, 4, min(max(filled, 0), width)), (x, y - 8)))
+
+    def queue_enemies(self, pool, x=None, y=None):
+        """
+        Queue every enemy in an EnemyPool (Enemy.draw / Boss.draw)
+
+        Args:
+            pool: EnemyPool to draw
+            x: Positions in pool.indices() order (default: current)
+            y: Positions in pool.indices() order (default: current)
+        """
+        indices = pool.indices()
+        if len(indices) == 0:
+            return
+        if x is None:
+            x = pool.x[indices]
+            y = pool.y[indices]
+
+        width = pool.width[indices]
+        filled = (pool.hp[indices] / pool.max_hp[indices]) * width
+        np.clip(filled, 0, width, out=filled)
+        charging = pool.charging_heavy[indices]
+        charge = (pool.heavy_attack_charge[indices] / 1.0) * width
+
+        batch = self.batch
+        rect = self.rect
+        health_bar = self.health_bar
+        for type_id, x, y, w, h, fill, is_charging, charge_width in zip(
+                pool.type_id[indices].tolist(),
+                x.astype(np.intp).tolist(), y.astype(np.intp).tolist(),
+                width.tolist(), pool.height[indices].tolist(), filled.astype(np.intp).tolist(),
+                charging.tolist(), charge.astype(np.intp).tolist()):
+            if BOSS_TYPES[type_id]:
+                # Flash red when charging heavy attack
+                batch.append((rect(RED if is_charging else TYPE_COLORS[type_id], w, h), (x, y)))
+                batch.append((health_bar(w, 6, fill), (x, y - 12)))
+                if is_charging and charge_width > 0:
+                    batch.append((rect(YELLOW, charge_width, 4), (x, y - 20)))
+            else:
+                batch.append((rect(TYPE_COLORS[type_id], w, h), (x, y)))
+                batch.append((health_bar(w, 4, fill), (x, y - 8)))
+
+    def flush(self, surface):
+        """Blit everything queued since the last flush in one call"""
+        if self._fblits:
+            self._fblits(surface, self.batch)
+        else:
+            surface.blits(self.batch, doreturn=False)
+        self.batch.clear()
@@ -0,0 +1,123 @@
+"""
+Shared fonts and rendered-text cache
+Building a pygame Font loads and parses the font file, and rendering text
+rasterizes every glyph, so both are done once: fonts are pooled by
+(name, size) and rendered surfaces are kept in an LRU cache keyed by
+(font name, size, text, antialias, color).
+
+Cached surfaces are shared - blit them, don't draw on them.
+"""
+
+from collections import OrderedDict
+import pygame
+
+
+class CachedFont:
+    """Font-like handle whose render() goes through a TextCache"""
+
+    __slots__ = ('cache', 'font', 'name', 'size')
+
+    def __init__(self, cache, font, name, size):
+        """
+        Initialize handle
+
+        Args:
+            cache: Owning TextCache
+            font: Pooled pygame Font
+            name: Font file (None for the default font)
+            size: Point size
+        """
+        self.cache = cache
+        self.font = font
+        self.name = name
+        self.size = size
+
+    def render(self, text, antialias, color):
+        """Same as pygame.font.Font.render, but cached"""
+        return self.cache.render(text, self.size, color, self.name, antialias)
+
+
+class TextCache:
+    """Font pool plus LRU cache of rendered text surfaces"""
+
+    def __init__(self, max_entries=512):
+        """
+        Initialize cache
+
+        Args:
+            max_entries: Rendered surfaces kept before the least recently
+                used is dropped
+        """
+        self.max_entries = max_entries
+        self.fonts = {}  # (name, size) -> pygame Font
+        self.handles = {}  # (name, size) -> CachedFont
+        self.surfaces = OrderedDict()  # (name, size, text, antialias, color) -> Surface
+
+        # Stats
+        self.hits = 0
+        self.misses = 0
+
+    def get_font(self, size, name=None):
+        """
+        Pooled pygame Font
+
+        Args:
+            size: Point size
+            name: Font file (None for the default font)
+
+        Returns:
+            pygame.font.Font: Shared font object
+        """
+        font = self.fonts.get((name, size))
+        if font is None:
+            font = pygame.font.Font(name, size)
+            self.fonts[(name, size)] = font
+        return font
+
+    def font(self, size, name=None):
+        """
+        Drop-in replacement for pygame.font.Font(name, size)
+
+        Returns:
+            CachedFont: Handle whose render() uses this cache
+        """
+        handle = self.handles.get((name, size))
+        if handle is None:
+            handle = CachedFont(self, self.get_font(size, name), name, size)
+            self.handles[(name, size)] = handle
+        return handle
+
+    def render(self, text, size, color, name=None, antialias=True):
+        """
+        Rendered text surface
+
+        Args:
+            text: String to render
+            size: Point size
+            color: RGB tuple
+            name: Font file (None for the default font)
+            antialias: Smooth glyph edges
+
+        Returns:
+            pygame.Surface: Shared surface (do not modify)
+        """
+        key = (name, size, text, antialias, color)
+        surfaces = self.surfaces
+        surface = surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.get_font(size, name).render(text, antialias, color)
+        surfaces[key] = surface
+        if len(surfaces) > self.max_entries:
+            surfaces.popitem(last=False)
+        return surface
+
+    @property
+    def hit_rate(self):
+        """Fraction of renders served from the cache"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
@@ -1,44 +1,118 @@
 """
 UI Drawing System for horizontal arena layout
 Handles stat panel, inventory, and wave info
+
+Panels are retained: each one is rendered into its own region of a
+window-sized layer Surface and only re-rendered when the values it shows
+change. The draw_* methods blit a panel to the screen only when it changed
+(or after invalidate()) and return the screen rect they touched, so the
+caller can pass just those rects to pygame.display.update().
 """
 
 import pygame
 from config import *
+from game.character import RACES, CLASSES
+from game.text_cache import TextCache
+
+# Screen region owned by each panel (later panels used to paint over the
+# edges of earlier ones, so the regions are cut where that happened)
+PANEL_RECTS = {
+    'top_bar': pygame.Rect(0, 0, WINDOW_WIDTH, TOP_BAR_HEIGHT),
+    'left_panel': pygame.Rect(0, TOP_BAR_HEIGHT, LEFT_PANEL_WIDTH,
+                              WINDOW_HEIGHT - TOP_BAR_HEIGHT - INVENTORY_HEIGHT),
+    'right_panel': pygame.Rect(WINDOW_WIDTH - RIGHT_PANEL_WIDTH, TOP_BAR_HEIGHT, RIGHT_PANEL_WIDTH,
+                               WINDOW_HEIGHT - TOP_BAR_HEIGHT - INVENTORY_HEIGHT),
+    'inventory': pygame.Rect(0, WINDOW_HEIGHT - INVENTORY_HEIGHT, WINDOW_WIDTH, INVENTORY_HEIGHT),
+}
 
 class UIManager:
     """Manages all UI drawing"""
     
-    def __init__(self, screen):
+    def __init__(self, screen, text_cache=None):
         """
         Initialize UI manager
         
         Args:
             screen: pygame screen surface
+            text_cache: TextCache shared with other screens (default: own cache)
         """
         self.screen = screen
-        self.font_large = pygame.font.Font(None, 36)
-        self.font_medium = pygame.font.Font(None, 28)
-        self.font_small = pygame.font.Font(None, 22)
+        self.text = text_cache or TextCache()
+        self.font_large = self.text.font(36)
+        self.font_medium = self.text.font(28)
+        self.font_small = self.text.font(22)
+        
+        # Retained panels
+        self.layer = pygame.Surface(screen.get_size())
+        self.panel_keys = {}  # Panel name -> values it was last rendered with
+        self.on_screen = set()  # Panels whose current render is on the screen
+    
+    def invalidate(self):
+        """Blit every panel again on its next draw (the screen was drawn over)"""
+        self.on_screen.clear()
+    
+    def restore(self, rect):
+        """Blit the retained panels back over part of the screen"""
+        self.screen.blit(self.layer, rect, rect)
+    
+    def _draw_panel(self, name, key, render, *args):
+        """
+        Re-render a panel if its values changed and blit it if needed
+        
+        Args:
+            name: Key in PANEL_RECTS
+            key: Tuple of every value the panel shows
+            render: Method drawing the panel onto a surface
+            *args: Arguments for render after the surface
+            
+        Returns:
+            pygame.Rect: Screen area updated, or None if nothing changed
+        """
+        rect = PANEL_RECTS[name]
+        if self.panel_keys.get(name) != key:
+            self.layer.set_clip(rect)
+            render(self.layer, *args)
+            self.layer.set_clip(None)
+            self.panel_keys[name] = key
+        elif name in self.on_screen:
+            return None
+        
+        self.screen.blit(self.layer, rect, rect)
+        self.on_screen.add(name)
+        return rect
         
     def draw_top_bar(self, floor, wave, total_waves):
         """Draw top status bar"""
-        pygame.draw.rect(self.screen, UI_BACKGROUND, (0, 0, WINDOW_WIDTH, TOP_BAR_HEIGHT))
-        pygame.draw.line(self.screen, UI_BORDER, (0, TOP_BAR_HEIGHT), (WINDOW_WIDTH, TOP_BAR_HEIGHT), 2)
+        return self._draw_panel('top_bar', (floor, wave, total_waves),
+                                self._render_top_bar, floor, wave, total_waves)
+    
+    def _render_top_bar(self, surface, floor, wave, total_waves):
+        """Render top status bar"""
+        pygame.draw.rect(surface, UI_BACKGROUND, (0, 0, WINDOW_WIDTH, TOP_BAR_HEIGHT))
+        pygame.draw.line(surface, UI_BORDER, (0, TOP_BAR_HEIGHT), (WINDOW_WIDTH, TOP_BAR_HEIGHT), 2)
         
         # Title
         title = self.font_large.render("AI DUNGEON CRAWLER", True, CYAN)
-        self.screen.blit(title, (WINDOW_WIDTH // 2 - 150, 5))
+        surface.blit(title, (WINDOW_WIDTH // 2 - 150, 5))
         
         # Floor/Wave info
         info = self.font_medium.render(f"Floor {floor} - Wave {wave}/{total_waves}", True, WHITE)
-        self.screen.blit(info, (WINDOW_WIDTH - 300, 10))
+        surface.blit(info, (WINDOW_WIDTH - 300, 10))
     
     def draw_left_panel(self, player, player_name=""):
         """Draw left stat panel"""
+        hp_fill = int((player.hp / player.max_hp) * (LEFT_PANEL_WIDTH - 20))
+        key = (player_name, player.race, player.character_class, int(player.hp), player.max_hp,
+               hp_fill, player.damage, player.base_damage, player.weapon_damage, player.defense,
+               player.base_defense, player.armor_defense, round(player.speed, 1),
+               player.weapon_id, player.armor_id)
+        return self._draw_panel('left_panel', key, self._render_left_panel, player, player_name)
+    
+    def _render_left_panel(self, surface, player, player_name):
+        """Render left stat panel"""
         panel_rect = pygame.Rect(0, TOP_BAR_HEIGHT, LEFT_PANEL_WIDTH, WINDOW_HEIGHT - TOP_BAR_HEIGHT)
-        pygame.draw.rect(self.screen, UI_BACKGROUND, panel_rect)
-        pygame.draw.line(self.screen, UI_BORDER, (LEFT_PANEL_WIDTH, TOP_BAR_HEIGHT), 
+        pygame.draw.rect(surface, UI_BACKGROUND, panel_rect)
+        pygame.draw.line(surface, UI_BORDER, (LEFT_PANEL_WIDTH, TOP_BAR_HEIGHT), 
                         (LEFT_PANEL_WIDTH, WINDOW_HEIGHT), 2)
         
         y = TOP_BAR_HEIGHT + 10
@@ -47,37 +121,36 @@ class UIManager:
         # Character name
         if player_name:
             name = self.font_medium.render(player_name, True, CYAN)
-            self.screen.blit(name, (x, y))
+            surface.blit(name, (x, y))
             y += 35
         
         # Race/Class
-        from game.character import RACES, CLASSES
         race_class = f"{RACES[player.race]['name']} {CLASSES[player.character_class]['name']}"
         rc_text = self.font_small.render(race_class, True, WHITE)
-        self.screen.blit(rc_text, (x, y))
+        surface.blit(rc_text, (x, y))
         y += 30
         
         # Divider
-        pygame.draw.line(self.screen, UI_BORDER, (x, y), (LEFT_PANEL_WIDTH - 10, y), 1)
+        pygame.draw.line(surface, UI_BORDER, (x, y), (LEFT_PANEL_WIDTH - 10, y), 1)
         y += 15
         
         # Stats header
         stats_header = self.font_medium.render("STATS", True, YELLOW)
-        self.screen.blit(stats_header, (x, y))
+        surface.blit(stats_header, (x, y))
         y += 30
         
         # HP
         hp_text = self.font_small.render(f"HP: {int(player.hp)}/{player.max_hp}", True, WHITE)
-        self.screen.blit(hp_text, (x, y))
+        surface.blit(hp_text, (x, y))
         y += 5
         
         # HP Bar
         bar_width = LEFT_PANEL_WIDTH - 20
         bar_height = 20
-        pygame.draw.rect(self.screen, RED, (x, y, bar_width, bar_height))
+        pygame.draw.rect(surface, RED, (x, y, bar_width, bar_height))
         hp_fill = int((player.hp / player.max_hp) * bar_width)
-        pygame.draw.rect(self.screen, GREEN, (x, y, hp_fill, bar_height))
-        pygame.draw.rect(self.screen, WHITE, (x, y, bar_width, bar_height), 2)
+        pygame.draw.rect(surface, GREEN, (x, y, hp_fill, bar_height))
+        pygame.draw.rect(surface, WHITE, (x, y, bar_width, bar_height), 2)
         y += 30
         
         # Other stats
@@ -90,50 +163,58 @@ class UIManager:
         
         for line in stat_lines:
             text = self.font_small.render(line, True, WHITE)
-            self.screen.blit(text, (x, y))
+            surface.blit(text, (x, y))
             y += 25
         
         y += 10
-        pygame.draw.line(self.screen, UI_BORDER, (x, y), (LEFT_PANEL_WIDTH - 10, y), 1)
+        pygame.draw.line(surface, UI_BORDER, (x, y), (LEFT_PANEL_WIDTH - 10, y), 1)
         y += 15
         
         # Equipment header
         equip_header = self.font_medium.render("EQUIPMENT", True, YELLOW)
-        self.screen.blit(equip_header, (x, y))
+        surface.blit(equip_header, (x, y))
         y += 30
         
         # Weapon
         weapon_text = self.font_small.render(f"⚔ {stats['weapon_name']}", True, WHITE)
-        self.screen.blit(weapon_text, (x, y))
+        surface.blit(weapon_text, (x, y))
         y += 25
         
         # Armor
         armor_text = self.font_small.render(f"🛡 {stats['armor_name']}", True, WHITE)
-        self.screen.blit(armor_text, (x, y))
+        surface.blit(armor_text, (x, y))
         y += 30
         
         # Skills header (placeholder)
-        pygame.draw.line(self.screen, UI_BORDER, (x, y), (LEFT_PANEL_WIDTH - 10, y), 1)
+        pygame.draw.line(surface, UI_BORDER, (x, y), (LEFT_PANEL_WIDTH - 10, y), 1)
         y += 15
         
         skills_header = self.font_medium.render("SKILLS", True, YELLOW)
-        self.screen.blit(skills_header, (x, y))
+        surface.blit(skills_header, (x, y))
         y += 30
         
         # Placeholder skills
         skills = ["Attack (SPACE)", "Defend (D)", "Special (Q)"]
         for skill in skills:
             skill_text = self.font_small.render(skill, True, LIGHT_GRAY)
-            self.screen.blit(skill_text, (x, y))
+            surface.blit(skill_text, (x, y))
             y += 25
     
     def draw_right_panel(self, wave_spawner, time_survived=0):
         """Draw right info panel"""
+        enemies_left = wave_spawner.get_enemies_remaining()
+        key = (wave_spawner.current_wave, wave_spawner.max_waves, enemies_left,
+               wave_spawner.wave_active, int(time_survived))
+        return self._draw_panel('right_panel', key, self._render_right_panel,
+                                wave_spawner, enemies_left, time_survived)
+    
+    def _render_right_panel(self, surface, wave_spawner, enemies_left, time_survived):
+        """Render right info panel"""
         panel_x = WINDOW_WIDTH - RIGHT_PANEL_WIDTH
         panel_rect = pygame.Rect(panel_x, TOP_BAR_HEIGHT, RIGHT_PANEL_WIDTH, 
                                  WINDOW_HEIGHT - TOP_BAR_HEIGHT)
-        pygame.draw.rect(self.screen, UI_BACKGROUND, panel_rect)
-        pygame.draw.line(self.screen, UI_BORDER, (panel_x, TOP_BAR_HEIGHT), 
+        pygame.draw.rect(surface, UI_BACKGROUND, panel_rect)
+        pygame.draw.line(surface, UI_BORDER, (panel_x, TOP_BAR_HEIGHT), 
                         (panel_x, WINDOW_HEIGHT), 2)
         
         y = TOP_BAR_HEIGHT + 20
@@ -141,13 +222,12 @@ class UIManager:
         
         # Wave info
         wave_text = self.font_medium.render(f"Wave {wave_spawner.current_wave}/{wave_spawner.max_waves}", True, CYAN)
-        self.screen.blit(wave_text, (x, y))
+        surface.blit(wave_text, (x, y))
         y += 35
         
         # Enemies remaining
-        enemies_left = wave_spawner.get_enemies_remaining()
         enemy_text = self.font_small.render(f"Enemies: {enemies_left}", True, RED if enemies_left > 0 else GREEN)
-        self.screen.blit(enemy_text, (x, y))
+        surface.blit(enemy_text, (x, y))
         y += 30
         
         # Status
@@ -162,26 +242,31 @@ class UIManager:
             color = GREEN
         
         status_text = self.font_medium.render(status, True, color)
-        self.screen.blit(status_text, (x, y))
+        surface.blit(status_text, (x, y))
         y += 40
         
-        pygame.draw.line(self.screen, UI_BORDER, (x, y), (WINDOW_WIDTH - 10, y), 1)
+        pygame.draw.line(surface, UI_BORDER, (x, y), (WINDOW_WIDTH - 10, y), 1)
         y += 20
         
         # Time
         time_text = self.font_small.render(f"Time: {int(time_survived)}s", True, WHITE)
-        self.screen.blit(time_text, (x, y))
+        surface.blit(time_text, (x, y))
     
     def draw_inventory(self, player):
         """Draw bottom inventory bar"""
+        return self._draw_panel('inventory', (player.health_potions,),
+                                self._render_inventory, player)
+    
+    def _render_inventory(self, surface, player):
+        """Render bottom inventory bar"""
         inv_y = WINDOW_HEIGHT - INVENTORY_HEIGHT
         inv_rect = pygame.Rect(0, inv_y, WINDOW_WIDTH, INVENTORY_HEIGHT)
-        pygame.draw.rect(self.screen, UI_BACKGROUND, inv_rect)
-        pygame.draw.line(self.screen, UI_BORDER, (0, inv_y), (WINDOW_WIDTH, inv_y), 2)
+        pygame.draw.rect(surface, UI_BACKGROUND, inv_rect)
+        pygame.draw.line(surface, UI_BORDER, (0, inv_y), (WINDOW_WIDTH, inv_y), 2)
         
         # Inventory title
         title = self.font_medium.render("INVENTORY", True, YELLOW)
-        self.screen.blit(title, (10, inv_y + 10))
+        surface.blit(title, (10, inv_y + 10))
         
         # Draw item slots
         slot_y = inv_y + 40
@@ -192,22 +277,22 @@ class UIManager:
             slot_rect = pygame.Rect(slot_x, slot_y, ITEM_SLOT_SIZE, ITEM_SLOT_SIZE)
             
             # Draw slot background
-            pygame.draw.rect(self.screen, (50, 50, 50), slot_rect)
-            pygame.draw.rect(self.screen, UI_BORDER, slot_rect, 2)
+            pygame.draw.rect(surface, (50, 50, 50), slot_rect)
+            pygame.draw.rect(surface, UI_BORDER, slot_rect, 2)
             
             # Draw potion in first slot if available
             if i == 0 and player.health_potions > 0:
                 # Draw potion icon (green circle)
                 center_x = slot_x + ITEM_SLOT_SIZE // 2
                 center_y = slot_y + ITEM_SLOT_SIZE // 2
-                pygame.draw.circle(self.screen, GREEN, (center_x, center_y), 20)
+                pygame.draw.circle(surface, GREEN, (center_x, center_y), 20)
                 
                 # Draw count
                 count_text = self.font_small.render(str(player.health_potions), True, WHITE)
                 count_rect = count_text.get_rect(center=(center_x, center_y))
-                self.screen.blit(count_text, count_rect)
+                surface.blit(count_text, count_rect)
         
         # Controls hint
         controls = self.font_small.render("P: Use Potion | I: Stats | WASD: Move | SPACE: Attack", 
                                          True, LIGHT_GRAY)
-        self.screen.blit(controls, (slot_x_start, inv_y + 10))
\ No newline at end of file
+        surface.blit(controls, (slot_x_start, inv_y + 10))
\ No newline at end of file
@@ -1,14 +1,20 @@
 """
 Wave spawner system for horizontal arena
 Spawns enemies in waves from the right side
+
+Pending spawns are a min-heap of (spawn time, order, type), so a tick only
+pops the entries that are due. Live enemies are counted from a shared
+registry (the EnemyPool) when one is given; otherwise the spawner keeps
+the enemies it spawned and drops them once they stop being alive.
 """
 
-import random
+import heapq
+from game.rng import RngContext
 
 class WaveSpawner:
     """Manages wave-based enemy spawning"""
     
-    def __init__(self, enemy_class, spawn_interval=3.0, max_waves=5):
+    def __init__(self, enemy_class, spawn_interval=3.0, max_waves=5, rng=None, registry=None):
         """
         Initialize wave spawner
         
@@ -16,13 +22,18 @@ class WaveSpawner:
             enemy_class: Enemy class to spawn
             spawn_interval: Seconds between enemy spawns (default: 3.0)
             max_waves: Maximum waves per floor (default: 5)
+            rng: RngContext for enemy types and spawn positions (default: unseeded)
+            registry: EnemyPool that enemy_class spawns into; its live count
+                replaces active_enemies (default: track enemies here)
         """
         self.enemy_class = enemy_class
+        self.rng = rng or RngContext()
+        self.registry = registry
         self.current_wave = 1
         self.max_waves = max_waves
         
         # Spawning
-        self.enemies_to_spawn = []
+        self.enemies_to_spawn = []  # Heap of (spawn_time, order, enemy_type)
         self.spawn_timer = 0
         self.spawn_interval = spawn_interval
         
@@ -30,8 +41,8 @@ class WaveSpawner:
         self.wave_active = False
         self.all_waves_complete = False
         
-        # Enemy list
-        self.active_enemies = []
+        # Spawned enemies that are still alive (without a registry)
+        self.active_enemies = set()
         
     def start_wave(self, wave_number, floor_number=1):
         """
@@ -53,11 +64,12 @@ class WaveSpawner:
         self.enemies_to_spawn = []
         
         for i in range(enemies_count):
-            enemy_type = random.choice(enemy_types)
+            enemy_type = self.rng.spawn_types.choice(enemy_types)
             # Stagger spawn times
             spawn_time = i * self.spawn_interval
-            self.enemies_to_spawn.append((spawn_time, enemy_type))
+            self.enemies_to_spawn.append((spawn_time, i, enemy_type))
         
+        heapq.heapify(self.enemies_to_spawn)
         self.spawn_timer = 0
         
     def update(self, dt, spawn_x, spawn_y_min, spawn_y_max):
@@ -79,26 +91,23 @@ class WaveSpawner:
         self.spawn_timer += dt
         new_enemies = []
         
-        # Check if any enemies should spawn
-        remaining = []
-        for spawn_time, enemy_type in self.enemies_to_spawn:
-            if self.spawn_timer >= spawn_time:
-                # Spawn this enemy!
-                x = spawn_x
-                y = random.randint(spawn_y_min, spawn_y_max)
-                enemy = self.enemy_class(x, y, enemy_type)
-                new_enemies.append(enemy)
-                self.active_enemies.append(enemy)
-            else:
-                remaining.append((spawn_time, enemy_type))
-        
-        self.enemies_to_spawn = remaining
-        
-        # Remove dead enemies from active list
-        self.active_enemies = [e for e in self.active_enemies if e.alive]
+        # Spawn every enemy that is due
+        queue = self.enemies_to_spawn
+        while queue and queue[0][0] <= self.spawn_timer:
+            spawn_time, order, enemy_type = heapq.heappop(queue)
+            x = spawn_x
+            y = self.rng.spawn_positions.randint(spawn_y_min, spawn_y_max)
+            enemy = self.enemy_class(x, y, enemy_type)
+            new_enemies.append(enemy)
+            if self.registry is None:
+                self.active_enemies.add(enemy)
+        
+        # Remove dead enemies from the active set
+        if self.registry is None:
+            self.active_enemies = {e for e in self.active_enemies if e.alive}
         
         # Check if wave complete
-        if len(self.enemies_to_spawn) == 0 and len(self.active_enemies) == 0:
+        if len(self.enemies_to_spawn) == 0 and self.get_active_count() == 0:
             self.wave_active = False
             
             # Check if all waves done
@@ -107,9 +116,15 @@ class WaveSpawner:
         
         return new_enemies
     
+    def get_active_count(self):
+        """Number of spawned enemies still alive"""
+        if self.registry is not None:
+            return len(self.registry)
+        return len(self.active_enemies)
+    
     def is_wave_complete(self):
         """Check if current wave is complete"""
-        return not self.wave_active and len(self.active_enemies) == 0
+        return not self.wave_active and self.get_active_count() == 0
     
     def is_all_complete(self):
         """Check if all waves are complete"""
@@ -117,7 +132,7 @@ class WaveSpawner:
     
     def get_enemies_remaining(self):
         """Get total enemies remaining (spawned + to spawn)"""
-        return len(self.active_enemies) + len(self.enemies_to_spawn)
+        return self.get_active_count() + len(self.enemies_to_spawn)
     
     def reset(self):
         """Reset spawner"""
@@ -125,5 +140,5 @@ class WaveSpawner:
         self.wave_active = False
         self.all_waves_complete = False
         self.enemies_to_spawn = []
-        self.active_enemies = []
+        self.active_enemies = set()
         self.spawn_timer = 0
\ No newline at end of file
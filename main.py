@@ -4,28 +4,86 @@ AI Dungeon Crawler - Horizontal Arena Version
 v0.2.0-dev - Wave-based combat with professional UI
 """
 
+import argparse
+import math
+import os
 import pygame
 import sys
+import time
 from config import *
-from game.player import Player
-from game.enemies import Enemy
-from game.dungeon import Room
-from game.items import HealthPotion
 from game.character import RACES, CLASSES, WEAPONS, ARMORS
-from game.wave_spawner import WaveSpawner
+from game.simulation import Simulation, Action
+from game.replay import InputRecorder, replay_file
 from game.ui_manager import UIManager
+from game.text_cache import TextCache
+from game.sprite_cache import SpriteCache, BAR_MARGIN
+from game.interpolation import Interpolator
+from game.profiler import FrameProfiler
+from benchmarks.stress import run_stress, add_arguments as add_stress_arguments
+
+# States with a running simulation (fast-forwarded in training mode)
+SIM_STATES = ('playing', 'wave_complete', 'floor_complete', 'game_over', 'victory')
 
 class Game:
     """Main game class with horizontal arena and wave system"""
     
-    def __init__(self):
-        """Initialize pygame and game components"""
+    def __init__(self, record_path=None, agent_options=None, tick_rate=SIM_RATE,
+                 render_fps=FPS, max_catch_up=MAX_CATCH_UP_TICKS, profile=False,
+                 trace_path=None, training=TRAINING_MODE, training_speed=TRAINING_SPEED,
+                 render_every=TRAINING_RENDER_EVERY):
+        """
+        Initialize pygame and game components
+        
+        Args:
+            record_path: Save each game's inputs to this replay file (optional;
+                in training mode every game gets a numbered file, e.g. run-3.rec)
+            agent_options: MCTSAgent keyword arguments to let the search
+                agent play instead of the keyboard (optional)
+            tick_rate: Simulation ticks per second
+            render_fps: Frames drawn per second at most (0 for uncapped)
+            max_catch_up: Most ticks run per frame; after a longer stall
+                the game slows down instead of running a burst of ticks
+            profile: Start with the frame-time overlay shown (F3 toggles it)
+            trace_path: Write per-frame phase timings to this CSV file (optional)
+            training: Fast-forward games without a frame cap; waves, floors
+                and new games start by themselves
+            training_speed: Target speed in training mode as a multiple of
+                real time (0 for as fast as possible)
+            render_every: Ticks between rendered frames in training mode
+                (0 for none)
+        """
         pygame.init()
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption(TITLE)
         self.clock = pygame.time.Clock()
         self.running = True
-        self.dt = 0
+        
+        # Fixed-step timing: frames add real time, ticks consume it
+        self.tick_rate = tick_rate
+        self.tick_dt = 1.0 / tick_rate
+        self.render_fps = render_fps
+        self.max_catch_up = max_catch_up
+        self.accumulator = 0.0  # Real time not yet simulated
+        self.alpha = 1.0  # Fraction of a tick between the last tick and this frame
+        self.dt = self.tick_dt
+        
+        # Frame profiler (None unless the overlay is shown or a trace is written)
+        self.show_profiler = profile
+        self.trace_path = trace_path
+        self.profiler = None
+        if profile or trace_path:
+            self.profiler = FrameProfiler(PROFILER_WINDOW, trace_path)
+        self.profiler_lines = []  # Rendered overlay rows
+        self.profiler_refreshed = None  # Profiler frame count the rows were rendered at
+        
+        # Training mode
+        self.training = training
+        self.training_speed = training_speed
+        self.render_every = render_every
+        self.ticks_since_draw = 0
+        self.speedup = 0.0  # Simulated seconds per real second, measured
+        self.speed_ticks = 0  # Ticks since speed_start
+        self.speed_start = None  # When fast-forwarding last (re)started measuring
         
         # Game state
         self.state = 'menu'
@@ -35,29 +93,25 @@ class Game:
         self.selected_class = 'warrior'
         self.player_name = ""
         
-        # Game objects
-        self.player = None
-        self.room = None
-        self.wave_spawner = None
-        self.ui_manager = UIManager(self.screen)
-        
-        # Wave/Floor tracking
-        self.current_floor = 1
-        self.current_wave = 1
-        self.max_floor = FLOORS
-        
-        # Enemies
-        self.enemies = []
-        
-        # Items
-        self.items = []
+        # Arena simulation (player, waves, enemies, items)
+        self.sim = None
+        self.text = TextCache()  # Fonts and rendered text shared by every screen
+        self.ui_manager = UIManager(self.screen, self.text)
+        self.sprites = SpriteCache()
+        self.interpolator = Interpolator()
+        
+        # Input
+        self.potion_requested = False
+        self.record_path = record_path
+        self.recorder = None
+        self.games_recorded = 0
+        self.agent_options = agent_options
+        self.agent = None  # MCTSAgent playing the current game
+        self.agent_character = None  # (race, class) the agent searches for
         
         # Timers
         self.wave_complete_timer = 0
         self.wave_complete_duration = 2.0
-        self.pickup_message = ""
-        self.pickup_timer = 0
-        self.time_survived = 0
         
         # Menu
         self.menu_selection = 0
@@ -73,12 +127,24 @@ class Game:
         # Stat screen
         self.show_stats = False
         
+        # Cached full-window surfaces
+        self.overlays = {}  # Alpha -> translucent black overlay
+        self.frozen_key = None  # (state, floor, wave) of the composed wave/floor screen
+        
     def handle_events(self):
         """Handle pygame events"""
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
                 
+            elif event.type == pygame.WINDOWEXPOSED:
+                # The window system lost our pixels; present everything again
+                self.ui_manager.invalidate()
+                self.frozen_key = None
+                
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.toggle_profiler()
+                
             elif event.type == pygame.KEYDOWN:
                 if self.state == 'menu':
                     self.handle_menu_input(event)
@@ -93,6 +159,18 @@ class Game:
                 elif self.state == 'game_over' or self.state == 'victory':
                     self.handle_gameover_input(event)
     
+    def toggle_profiler(self):
+        """Show or hide the frame-time overlay"""
+        self.show_profiler = not self.show_profiler
+        if self.show_profiler and not self.profiler:
+            self.profiler = FrameProfiler(PROFILER_WINDOW)
+            self.profiler.start_frame()
+            self.profiler_refreshed = None
+        elif not self.show_profiler and not self.trace_path:
+            self.profiler = None  # Nothing left to record
+        if self.sim:
+            self.sim.profiler = self.profiler
+    
     def handle_menu_input(self, event):
         """Handle menu input"""
         if event.key == pygame.K_UP:
@@ -148,109 +226,88 @@ class Game:
     def handle_game_input(self, event):
         """Handle in-game input"""
         if event.key == pygame.K_ESCAPE:
+            self.save_recording()
             self.state = 'menu'
         elif event.key == pygame.K_i:
             self.show_stats = not self.show_stats
         elif event.key == pygame.K_p:
-            # Use potion
-            if self.player.health_potions > 0 and self.player.hp < self.player.max_hp:
-                heal_amount = min(HEALTH_POTION_HEAL, self.player.max_hp - self.player.hp)
-                self.player.hp += heal_amount
-                self.player.health_potions -= 1
-                self.pickup_message = f"Healed {heal_amount} HP!"
-                self.pickup_timer = 2.0
+            # Use potion on the next tick
+            self.potion_requested = True
     
     def handle_wave_complete_input(self, event):
         """Handle wave complete screen input"""
         if event.key == pygame.K_RETURN or event.key == pygame.K_SPACE:
-            if self.current_wave < WAVES_PER_FLOOR:
-                # Start next wave
-                self.current_wave += 1
-                self.wave_spawner.start_wave(self.current_wave, self.current_floor)
-                self.state = 'playing'
-            else:
-                # Floor complete
-                self.state = 'floor_complete'
+            self.advance_wave()
     
     def handle_floor_complete_input(self, event):
         """Handle floor complete screen input"""
         if event.key == pygame.K_RETURN or event.key == pygame.K_SPACE:
-            if self.current_floor < self.max_floor:
-                # Next floor
-                self.current_floor += 1
-                self.current_wave = 1
-                self.start_floor()
-            else:
-                # Victory!
-                self.state = 'victory'
+            self.advance_floor()
+    
+    def advance_wave(self):
+        """Leave the wave complete screen"""
+        if self.recorder:
+            self.recorder.record_advance()
+        self.sim.next_wave()
+        self.state = self.sim.state
+        self.interpolator.reset()
+    
+    def advance_floor(self):
+        """Leave the floor complete screen"""
+        if self.recorder:
+            self.recorder.record_advance()
+        self.sim.next_floor()
+        self.state = self.sim.state
+        self.interpolator.reset()
     
     def handle_gameover_input(self, event):
         """Handle game over input"""
         if event.key == pygame.K_RETURN or event.key == pygame.K_SPACE:
             self.state = 'menu'
-            self.player = None
-            self.enemies = []
-            self.items = []
+            self.sim = None
     
     def start_game(self):
         """Initialize game after character creation"""
-        # Create player at left spawn position
-        spawn_x = ARENA_X + PLAYER_SPAWN_X
-        spawn_y = ARENA_Y + PLAYER_SPAWN_Y
-        
-        self.player = Player(
-            spawn_x, 
-            spawn_y,
-            race=self.selected_race,
-            character_class=self.selected_class
-        )
-        
-        # Reset game state
-        self.current_floor = 1
-        self.current_wave = 1
-        self.time_survived = 0
-        
-        # Start first floor
-        self.start_floor()
+        self.sim = Simulation(race=self.selected_race, character_class=self.selected_class,
+                              dt=self.tick_dt)
+        self.sim.reset()
+        self.sim.profiler = self.profiler
+        self.potion_requested = False
+        self.state = self.sim.state
+        self.interpolator.reset()
+        
+        if self.record_path:
+            self.recorder = InputRecorder(self.selected_race, self.selected_class,
+                                          self.sim.rng.seed, self.tick_rate)
+        
+        # Keep the agent (and its worker processes) across games with the same character
+        character = (self.selected_race, self.selected_class)
+        if self.agent_options is not None and self.agent_character != character:
+            from ai.mcts import MCTSAgent  # Needs gymnasium, which manual play doesn't
+            
+            self.close_agent()
+            self.agent = MCTSAgent(self.selected_race, self.selected_class,
+                                   dt=self.tick_dt, **self.agent_options)
+            self.agent_character = character
     
-    def start_floor(self):
-        """Start a new floor"""
-        # Create arena room (just for collision detection)
-        self.room = Room(ARENA_WIDTH, ARENA_HEIGHT)
-        
-        # Reset player position
-        self.player.x = ARENA_X + PLAYER_SPAWN_X
-        self.player.y = ARENA_Y + PLAYER_SPAWN_Y
-        
-        # Reset enemies
-        self.enemies = []
-        
-        # Create wave spawner
-        self.wave_spawner = WaveSpawner(
-            Enemy, 
-            spawn_interval=WAVE_SPAWN_INTERVAL,
-            max_waves=WAVES_PER_FLOOR
-        )
-        
-        # Start first wave
-        self.wave_spawner.start_wave(self.current_wave, self.current_floor)
-        
-        # Spawn some health potions
-        self.spawn_potions()
-        
-        self.state = 'playing'
+    def close_agent(self):
+        """Stop the search agent and its worker processes"""
+        if self.agent:
+            self.agent.close()
+            self.agent = None
+            self.agent_character = None
     
-    def spawn_potions(self):
-        """Spawn health potions in arena"""
-        import random
-        self.items = []
-        
-        num_potions = 2 + self.current_floor // 2  # More potions on later floors
-        
-        for _ in range(num_potions):
-            x = ARENA_X + random.randint(100, ARENA_WIDTH - 100)
-            y = ARENA_Y + random.randint(100, ARENA_HEIGHT - 100)
-            self.items.append(HealthPotion(x, y))
+    def save_recording(self):
+        """Write the current game's inputs to the replay file"""
+        if self.recorder:
+            path = self.record_path
+            if self.training:
+                # Games restart by themselves, so number the files instead of overwriting
+                self.games_recorded += 1
+                stem, ext = os.path.splitext(path)
+                path = f"{stem}-{self.games_recorded}{ext}"
+            self.recorder.save(path)
+            self.recorder = None
     
     def update(self):
         """Update game state"""
@@ -260,129 +317,108 @@ class Game:
             self.update_wave_complete()
         elif self.state == 'floor_complete':
             self.update_floor_complete()
+        elif self.state in ('game_over', 'victory'):
+            self.save_recording()
+            self.update_game_over()
     
     def update_playing(self):
         """Update playing state"""
-        # Time tracking
-        self.time_survived += self.dt
-        
-        # Update wave spawner
-        new_enemies = self.wave_spawner.update(
-            self.dt,
-            ARENA_X + ENEMY_SPAWN_X,
-            ARENA_Y + ENEMY_SPAWN_Y_MIN,
-            ARENA_Y + ENEMY_SPAWN_Y_MAX
-        )
-        self.enemies.extend(new_enemies)
-        
-        # Update player
+        if self.agent:
+            action = self.agent.act(self.sim)
+            if self.profiler:
+                self.profiler.lap('agent')
+            if self.sim.tick_count % self.tick_rate == 0 and not self.training:
+                pygame.display.set_caption(
+                    f"{TITLE} - MCTS {self.agent.rollouts_per_second:,.0f} rollouts/s")
+        else:
+            action = self.read_action()
+        if self.profiler:
+            self.profiler.lap('input')
+        if self.recorder:
+            self.recorder.record(action)
+        if not self.training:  # Training frames are too far apart to blend
+            self.interpolator.save(self.sim)
+        self.sim.step(action)
+        
+        if self.sim.state != self.state:
+            self.state = self.sim.state
+            self.wave_complete_timer = 0
+    
+    def read_action(self):
+        """Build this tick's Action from the keyboard"""
         keys = pygame.key.get_pressed()
-        dx = 0
-        dy = 0
+        move_x = 0
+        move_y = 0
         
         if keys[pygame.K_w] or keys[pygame.K_UP]:
-            dy = -PLAYER_SPEED
+            move_y = -1
         if keys[pygame.K_s] or keys[pygame.K_DOWN]:
-            dy = PLAYER_SPEED
+            move_y = 1
         if keys[pygame.K_a] or keys[pygame.K_LEFT]:
-            dx = -PLAYER_SPEED
+            move_x = -1
         if keys[pygame.K_d] or keys[pygame.K_RIGHT]:
-            dx = PLAYER_SPEED
-        
-        # Move player with arena bounds checking
-        old_x, old_y = self.player.x, self.player.y
-        self.player.x += dx
-        self.player.y += dy
-        
-        # Keep in arena bounds
-        player_rect = self.player.get_rect()
-        if player_rect.left < ARENA_X:
-            self.player.x = ARENA_X
-        if player_rect.right > ARENA_X + ARENA_WIDTH:
-            self.player.x = ARENA_X + ARENA_WIDTH - player_rect.width
-        if player_rect.top < ARENA_Y:
-            self.player.y = ARENA_Y
-        if player_rect.bottom > ARENA_Y + ARENA_HEIGHT:
-            self.player.y = ARENA_Y + ARENA_HEIGHT - player_rect.height
-        
-        # Update player
-        self.player.update(self.dt)
-        
-        # Attack
-        if keys[pygame.K_SPACE]:
-            if self.player.attack_cooldown <= 0:
-                self.player_attack()
-        
-        # Update enemies
-        for enemy in self.enemies[:]:
-            enemy.update(self.dt, self.player, self.room)
-            
-            # Enemy attacks
-            if enemy.can_attack():
-                distance = ((self.player.x - enemy.x)**2 + (self.player.y - enemy.y)**2)**0.5
-                attack_range = RANGED_RANGE if enemy.attack_type == 'ranged' else MELEE_RANGE
-                
-                if distance <= attack_range:
-                    enemy.attack(self.player)
-            
-            # Remove dead enemies
-            if not enemy.alive:
-                self.enemies.remove(enemy)
-                # Remove from wave spawner's active list too
-                if enemy in self.wave_spawner.active_enemies:
-                    self.wave_spawner.active_enemies.remove(enemy)
-        
-        # Update items
-        for item in self.items[:]:
-            if item.check_pickup(self.player):
-                if isinstance(item, HealthPotion):
-                    self.player.health_potions += 1
-                    self.pickup_message = "Picked up Health Potion!"
-                    self.pickup_timer = 2.0
-                self.items.remove(item)
-        
-        # Update timers
-        if self.pickup_timer > 0:
-            self.pickup_timer -= self.dt
-        
-        # Check wave complete
-        if self.wave_spawner.is_wave_complete() and len(self.enemies) == 0:
-            if self.current_wave < WAVES_PER_FLOOR:
-                self.state = 'wave_complete'
-                self.wave_complete_timer = 0
-            else:
-                # All waves complete = floor complete
-                self.state = 'floor_complete'
-        
-        # Check player death
-        if self.player.hp <= 0:
-            self.state = 'game_over'
+            move_x = 1
+        
+        action = Action(move_x, move_y, bool(keys[pygame.K_SPACE]), self.potion_requested)
+        self.potion_requested = False
+        return action
     
     def update_wave_complete(self):
         """Update wave complete state"""
         self.wave_complete_timer += self.dt
+        
+        # The agent and training mode move on by themselves after a short pause
+        if ((self.agent or self.training)
+                and self.wave_complete_timer >= self.wave_complete_duration):
+            self.advance_wave()
     
     def update_floor_complete(self):
         """Update floor complete state"""
-        pass
+        self.wave_complete_timer += self.dt
+        
+        if ((self.agent or self.training)
+                and self.wave_complete_timer >= self.wave_complete_duration):
+            self.advance_floor()
     
-    def player_attack(self):
-        """Handle player attacking"""
-        self.player.attack_cooldown = ATTACK_COOLDOWN
+    def update_game_over(self):
+        """Update game over / victory state"""
+        self.wave_complete_timer += self.dt
         
-        # Find enemies in range
-        for enemy in self.enemies:
-            distance = ((self.player.x - enemy.x)**2 + (self.player.y - enemy.y)**2)**0.5
-            attack_range = RANGED_RANGE if self.player.weapon_type == 'ranged' else MELEE_RANGE
-            
-            if distance <= attack_range:
-                # Deal damage
-                damage = self.player.damage
-                enemy.take_damage(damage)
+        # Training mode starts the next game by itself
+        if self.training and self.wave_complete_timer >= self.wave_complete_duration:
+            self.start_game()
     
     def draw(self):
         """Draw everything"""
+        if self.state == 'playing' and not self.show_stats:
+            # Only the arena and panels that changed go to the display
+            rects = self.draw_playing()
+            pygame.display.update(rects)
+            if self.profiler:
+                self.profiler.lap('flip')
+            self.frozen_key = None
+            return
+        
+        if self.state in ('wave_complete', 'floor_complete'):
+            # Nothing moves while these screens are open: compose the frame once
+            key = (self.state, self.sim.current_floor, self.sim.current_wave)
+            if key != self.frozen_key:
+                self.frozen_key = key
+                if self.state == 'wave_complete':
+                    self.draw_wave_complete()
+                else:
+                    self.draw_floor_complete()
+                if self.profiler:
+                    self.profiler.lap('ui_panels')
+                pygame.display.flip()
+                if self.profiler:
+                    self.profiler.lap('flip')
+                self.ui_manager.invalidate()
+            return
+        
+        self.frozen_key = None
         self.screen.fill(BLACK)
+        self.ui_manager.invalidate()  # Retained panels must be blitted again
         
         if self.state == 'menu':
             self.draw_menu()
@@ -390,21 +426,32 @@ class Game:
             self.draw_character_creation()
         elif self.state == 'playing':
             self.draw_playing()
-        elif self.state == 'wave_complete':
-            self.draw_wave_complete()
-        elif self.state == 'floor_complete':
-            self.draw_floor_complete()
         elif self.state == 'game_over':
             self.draw_game_over()
         elif self.state == 'victory':
             self.draw_victory()
         
+        if self.profiler:
+            self.profiler.lap('ui_panels')
         pygame.display.flip()
+        if self.profiler:
+            self.profiler.lap('flip')
+        self.ui_manager.invalidate()  # Panels were drawn over
+    
+    def get_overlay(self, alpha):
+        """Full-window translucent black overlay (built once per alpha)"""
+        overlay = self.overlays.get(alpha)
+        if overlay is None:
+            overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+            overlay.set_alpha(alpha)
+            overlay.fill(BLACK)
+            self.overlays[alpha] = overlay
+        return overlay
     
     def draw_menu(self):
         """Draw main menu"""
-        font_large = pygame.font.Font(None, 72)
-        font_medium = pygame.font.Font(None, 48)
+        font_large = self.text.font(72)
+        font_medium = self.text.font(48)
         
         # Title
         title = font_large.render("AI DUNGEON CRAWLER", True, CYAN)
@@ -425,9 +472,9 @@ class Game:
     
     def draw_character_creation(self):
         """Draw character creation screens"""
-        font_large = pygame.font.Font(None, 64)
-        font_medium = pygame.font.Font(None, 36)
-        font_small = pygame.font.Font(None, 28)
+        font_large = self.text.font(64)
+        font_medium = self.text.font(36)
+        font_small = self.text.font(28)
         
         if self.creation_step == 0:  # Race selection
             title = font_large.render("Choose Your Race", True, CYAN)
@@ -509,38 +556,83 @@ class Game:
             self.screen.blit(inst, (WINDOW_WIDTH // 2 - 350, WINDOW_HEIGHT - 50))
     
     def draw_playing(self):
-        """Draw playing state with horizontal UI"""
-        # Draw UI panels
-        self.ui_manager.draw_top_bar(self.current_floor, self.current_wave, WAVES_PER_FLOOR)
-        self.ui_manager.draw_left_panel(self.player, self.player_name)
-        self.ui_manager.draw_right_panel(self.wave_spawner, self.time_survived)
-        self.ui_manager.draw_inventory(self.player)
-        
-        # Draw arena background
+        """
+        Draw playing state with horizontal UI
+        
+        Returns:
+            list: Screen rects changed this frame
+        """
+        # Draw UI panels (each returns None when unchanged)
+        panels = [
+            self.ui_manager.draw_top_bar(self.sim.current_floor, self.sim.current_wave, WAVES_PER_FLOOR),
+            self.ui_manager.draw_left_panel(self.sim.player, self.player_name),
+            self.ui_manager.draw_right_panel(self.sim.wave_spawner, self.sim.time_survived),
+            self.ui_manager.draw_inventory(self.sim.player),
+        ]
+        if self.profiler:
+            self.profiler.lap('ui_panels')
+        
+        # Draw arena background; health bars of enemies at the top edge
+        # overhang the top bar by up to BAR_MARGIN, so that strip is restored
+        # from the retained panels and redrawn with the arena
         arena_rect = pygame.Rect(ARENA_X, ARENA_Y, ARENA_WIDTH, ARENA_HEIGHT)
+        dirty_rect = pygame.Rect(ARENA_X, ARENA_Y - BAR_MARGIN, ARENA_WIDTH, ARENA_HEIGHT + BAR_MARGIN)
+        self.ui_manager.restore(pygame.Rect(ARENA_X, ARENA_Y - BAR_MARGIN, ARENA_WIDTH, BAR_MARGIN))
+        self.screen.set_clip(dirty_rect)
         pygame.draw.rect(self.screen, DARK_GRAY, arena_rect)
         pygame.draw.rect(self.screen, UI_BORDER, arena_rect, 2)
         
-        # Draw items
-        for item in self.items:
-            item.draw(self.screen)
-        
-        # Draw player
-        self.player.draw(self.screen)
-        
-        # Draw enemies
-        for enemy in self.enemies:
-            enemy.draw(self.screen)
+        # Draw items, player and enemies (one batched blit) between the last two ticks
+        self.sprites.draw(self.screen, self.sim.items, self.sim.player, self.sim.enemies,
+                          self.interpolator.positions(self.sim, self.alpha))
         
         # Draw pickup message
-        if self.pickup_timer > 0:
-            font = pygame.font.Font(None, 32)
-            message = font.render(self.pickup_message, True, GREEN)
+        if self.sim.pickup_timer > 0:
+            message = self.text.render(self.sim.pickup_message, 32, GREEN)
             self.screen.blit(message, (ARENA_X + ARENA_WIDTH // 2 - 100, ARENA_Y + 50))
         
+        # Draw achieved fast-forward speed
+        if self.training:
+            target = f"{self.training_speed:,.0f}x" if self.training_speed > 0 else "uncapped"
+            speed = self.text.render(f"Fast-forward {self.speedup:,.0f}x (target {target})", 24, YELLOW)
+            self.screen.blit(speed, (ARENA_X + ARENA_WIDTH - speed.get_width() - 10, ARENA_Y + 10))
+        
+        # Draw frame-time overlay if toggled
+        if self.show_profiler:
+            self.draw_profiler_overlay()
+        self.screen.set_clip(None)
+        if self.profiler:
+            self.profiler.lap('arena_draw')
+        
         # Draw stat overlay if toggled
         if self.show_stats:
             self.draw_stat_overlay()
+        
+        return [rect for rect in panels if rect] + [dirty_rect]
+    
+    def draw_profiler_overlay(self):
+        """Draw rolling p50/p99 milliseconds per timing scope in the arena corner"""
+        profiler = self.profiler
+        if (self.profiler_refreshed is None
+                or profiler.frames - self.profiler_refreshed >= PROFILER_REFRESH):
+            # Re-render the rows every PROFILER_REFRESH frames
+            self.profiler_refreshed = profiler.frames
+            rows = [("scope", "p50 ms", "p99 ms")]
+            for name, (p50, p99) in profiler.percentiles().items():
+                rows.append((name, f"{p50:.2f}", f"{p99:.2f}"))
+            self.profiler_lines = [
+                [self.text.render(cell, 22, YELLOW if i == 0 else WHITE) for cell in row]
+                for i, row in enumerate(rows)
+            ]
+        
+        x = ARENA_X + 10
+        y = ARENA_Y + 10
+        self.screen.fill(BLACK, (x, y, 270, len(self.profiler_lines) * 20 + 10))
+        for name, p50, p99 in self.profiler_lines:
+            self.screen.blit(name, (x + 8, y + 6))
+            self.screen.blit(p50, (x + 140, y + 6))
+            self.screen.blit(p99, (x + 205, y + 6))
+            y += 20
     
     def draw_wave_complete(self):
         """Draw wave complete screen"""
@@ -548,16 +640,13 @@ class Game:
         self.draw_playing()
         
         # Overlay
-        overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
-        overlay.set_alpha(200)
-        overlay.fill(BLACK)
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self.get_overlay(200), (0, 0))
         
-        font_large = pygame.font.Font(None, 72)
-        font_medium = pygame.font.Font(None, 48)
+        font_large = self.text.font(72)
+        font_medium = self.text.font(48)
         
         # Title
-        title = font_large.render(f"WAVE {self.current_wave} COMPLETE!", True, GREEN)
+        title = font_large.render(f"WAVE {self.sim.current_wave} COMPLETE!", True, GREEN)
         title_rect = title.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 - 50))
         self.screen.blit(title, title_rect)
         
@@ -572,21 +661,18 @@ class Game:
         self.draw_playing()
         
         # Overlay
-        overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
-        overlay.set_alpha(200)
-        overlay.fill(BLACK)
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self.get_overlay(200), (0, 0))
         
-        font_large = pygame.font.Font(None, 72)
-        font_medium = pygame.font.Font(None, 48)
+        font_large = self.text.font(72)
+        font_medium = self.text.font(48)
         
         # Title
-        title = font_large.render(f"FLOOR {self.current_floor} COMPLETE!", True, GOLD)
+        title = font_large.render(f"FLOOR {self.sim.current_floor} COMPLETE!", True, GOLD)
         title_rect = title.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 - 50))
         self.screen.blit(title, title_rect)
         
         # Instruction
-        if self.current_floor < self.max_floor:
+        if self.sim.current_floor < self.sim.max_floor:
             inst = font_medium.render("Press ENTER for Next Floor", True, WHITE)
         else:
             inst = font_medium.render("Press ENTER to Continue", True, WHITE)
@@ -597,8 +683,8 @@ class Game:
         """Draw game over screen"""
         self.screen.fill(BLACK)
         
-        font_large = pygame.font.Font(None, 96)
-        font_medium = pygame.font.Font(None, 48)
+        font_large = self.text.font(96)
+        font_medium = self.text.font(48)
         
         # Title
         title = font_large.render("GAME OVER", True, RED)
@@ -606,7 +692,7 @@ class Game:
         self.screen.blit(title, title_rect)
         
         # Stats
-        stats_text = f"Reached Floor {self.current_floor}, Wave {self.current_wave}"
+        stats_text = f"Reached Floor {self.sim.current_floor}, Wave {self.sim.current_wave}"
         stats = font_medium.render(stats_text, True, WHITE)
         stats_rect = stats.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2))
         self.screen.blit(stats, stats_rect)
@@ -620,8 +706,8 @@ class Game:
         """Draw victory screen"""
         self.screen.fill(BLACK)
         
-        font_large = pygame.font.Font(None, 96)
-        font_medium = pygame.font.Font(None, 48)
+        font_large = self.text.font(96)
+        font_medium = self.text.font(48)
         
         # Title
         title = font_large.render("VICTORY!", True, GOLD)
@@ -629,12 +715,12 @@ class Game:
         self.screen.blit(title, title_rect)
         
         # Stats
-        stats_text = f"Completed All {self.max_floor} Floors!"
+        stats_text = f"Completed All {self.sim.max_floor} Floors!"
         stats = font_medium.render(stats_text, True, WHITE)
         stats_rect = stats.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2))
         self.screen.blit(stats, stats_rect)
         
-        time_text = f"Time: {int(self.time_survived)}s"
+        time_text = f"Time: {int(self.sim.time_survived)}s"
         time_display = font_medium.render(time_text, True, CYAN)
         time_rect = time_display.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 + 50))
         self.screen.blit(time_display, time_rect)
@@ -647,21 +733,18 @@ class Game:
     def draw_stat_overlay(self):
         """Draw full stat overlay (press I)"""
         # Semi-transparent overlay
-        overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
-        overlay.set_alpha(230)
-        overlay.fill(BLACK)
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self.get_overlay(230), (0, 0))
         
-        font_large = pygame.font.Font(None, 48)
-        font_medium = pygame.font.Font(None, 36)
-        font_small = pygame.font.Font(None, 28)
+        font_large = self.text.font(48)
+        font_medium = self.text.font(36)
+        font_small = self.text.font(28)
         
         # Title
         title = font_large.render("CHARACTER STATS", True, CYAN)
         self.screen.blit(title, (WINDOW_WIDTH // 2 - 180, 50))
         
         # Get stats
-        stats = self.player.get_stat_summary()
+        stats = self.sim.player.get_stat_summary()
         
         y = 150
         x = WINDOW_WIDTH // 2 - 300
@@ -669,10 +752,10 @@ class Game:
         # Display all stats
         stat_lines = [
             ("Name", self.player_name),
-            ("Race", RACES[self.player.race]['name']),
-            ("Class", CLASSES[self.player.character_class]['name']),
+            ("Race", RACES[self.sim.player.race]['name']),
+            ("Class", CLASSES[self.sim.player.character_class]['name']),
             ("", ""),
-            ("HP", f"{int(self.player.hp)}/{self.player.max_hp}"),
+            ("HP", f"{int(self.sim.player.hp)}/{self.sim.player.max_hp}"),
             ("Damage", f"{stats['damage']} ({stats['base_damage']} + {stats['weapon_damage']})"),
             ("Defense", f"{stats['defense']} ({stats['base_defense']} + {stats['armor_defense']})"),
             ("Speed", f"{stats['speed']}"),
@@ -680,7 +763,7 @@ class Game:
             ("Weapon", stats['weapon_name']),
             ("Armor", stats['armor_name']),
             ("", ""),
-            ("Potions", str(self.player.health_potions)),
+            ("Potions", str(self.sim.player.health_potions)),
         ]
         
         for label, value in stat_lines:
@@ -698,27 +781,148 @@ class Game:
         inst = font_small.render("Press I to Close", True, LIGHT_GRAY)
         self.screen.blit(inst, (WINDOW_WIDTH // 2 - 100, WINDOW_HEIGHT - 50))
     
+    def fast_forward_frame(self):
+        """
+        One pass of the training loop: no frame cap, as many ticks as the
+        target speed allows (at most render_every, or one simulated second
+        when nothing is rendered), and a frame every render_every ticks
+        """
+        frame_time = self.clock.tick() / 1000.0  # Measures only, never waits
+        if self.training_speed > 0:
+            self.accumulator += frame_time * self.training_speed
+        else:
+            self.accumulator = math.inf
+        batch = self.render_every or self.tick_rate
+        self.accumulator = min(self.accumulator, batch * self.tick_dt)
+        if self.profiler:
+            self.profiler.start_frame()
+        
+        self.handle_events()
+        if self.profiler:
+            self.profiler.lap('input')
+        
+        ticks = 0
+        while self.accumulator >= self.tick_dt and self.state in SIM_STATES:
+            self.update()
+            self.accumulator -= self.tick_dt
+            ticks += 1
+        if ticks == 0 and self.training_speed > 0 and self.accumulator < self.tick_dt:
+            # Sleep until the next tick is due instead of spinning
+            time.sleep((self.tick_dt - self.accumulator) / self.training_speed)
+        self.measure_speed(ticks)
+        
+        # Sample a frame every render_every ticks
+        self.ticks_since_draw += ticks
+        if self.render_every and self.ticks_since_draw >= self.render_every:
+            self.ticks_since_draw = 0
+            self.alpha = 1.0
+            self.draw()
+        if self.profiler:
+            self.profiler.end_frame()
+    
+    def measure_speed(self, ticks):
+        """Track simulated against real time and show the speedup about once a second"""
+        now = time.perf_counter()
+        if self.speed_start is None:
+            self.speed_start = now
+            self.speed_ticks = 0
+        self.speed_ticks += ticks
+        elapsed = now - self.speed_start
+        if elapsed >= 1.0:
+            self.speedup = self.speed_ticks * self.tick_dt / elapsed
+            self.speed_ticks = 0
+            self.speed_start = now
+            pygame.display.set_caption(f"{TITLE} - fast-forward {self.speedup:,.0f}x real time")
+    
     def run(self):
         """Main game loop"""
         while self.running:
-            # Calculate delta time
-            self.dt = self.clock.tick(FPS) / 1000.0  # Convert to seconds
+            if self.training and self.state in SIM_STATES:
+                self.fast_forward_frame()
+                continue
+            self.speed_start = None  # Measure afresh when fast-forwarding resumes
+            
+            # Real time since the last frame, capped so a stall can't queue
+            # more than max_catch_up ticks
+            frame_time = self.clock.tick(self.render_fps) / 1000.0  # Convert to seconds
+            self.accumulator = min(self.accumulator + frame_time,
+                                   self.max_catch_up * self.tick_dt)
+            if self.profiler:
+                self.profiler.start_frame()
             
             # Handle events
             self.handle_events()
+            if self.profiler:
+                self.profiler.lap('input')
             
-            # Update
-            self.update()
+            # Update in fixed ticks
+            while self.accumulator >= self.tick_dt:
+                self.update()
+                self.accumulator -= self.tick_dt
             
-            # Draw
+            # Draw, blending positions by how far into the next tick we are
+            self.alpha = self.accumulator / self.tick_dt
             self.draw()
+            if self.profiler:
+                self.profiler.end_frame()
         
+        self.save_recording()
+        self.close_agent()
+        if self.profiler:
+            self.profiler.close()
         pygame.quit()
         sys.exit()
 
 def main():
     """Entry point"""
-    game = Game()
+    parser = argparse.ArgumentParser(description=TITLE)
+    parser.add_argument('--record', metavar='FILE',
+                        help="save each game's inputs to a replay file (numbered per game in training mode)")
+    parser.add_argument('--replay', metavar='FILE', help="re-run a replay file headlessly and exit")
+    parser.add_argument('--mcts', action='store_true', help="let the tree search agent play")
+    parser.add_argument('--mcts-budget', metavar='MS', type=float, default=8.0,
+                        help="search time per tick in milliseconds (default 8)")
+    parser.add_argument('--mcts-workers', metavar='N', type=int, default=0,
+                        help="extra search processes (default 0)")
+    parser.add_argument('--tick-rate', metavar='HZ', type=int, default=SIM_RATE,
+                        help=f"simulation ticks per second (default {SIM_RATE})")
+    parser.add_argument('--render-fps', metavar='FPS', type=int, default=FPS,
+                        help=f"frame rate cap, 0 for uncapped (default {FPS})")
+    parser.add_argument('--max-catch-up', metavar='N', type=int, default=MAX_CATCH_UP_TICKS,
+                        help=f"most ticks run per frame (default {MAX_CATCH_UP_TICKS})")
+    parser.add_argument('--profile', action='store_true',
+                        help="show the frame-time overlay from the start (F3 toggles it)")
+    parser.add_argument('--profile-trace', metavar='FILE',
+                        help="write per-frame phase timings to a CSV file")
+    parser.add_argument('--training', action='store_true', default=TRAINING_MODE,
+                        help="fast-forward mode: uncapped speed, games restart by themselves")
+    parser.add_argument('--training-speed', metavar='X', type=float, default=TRAINING_SPEED,
+                        help=f"target multiple of real time, 0 for uncapped (default {TRAINING_SPEED})")
+    parser.add_argument('--render-every', metavar='N', type=int, default=TRAINING_RENDER_EVERY,
+                        help=f"ticks between rendered frames in training mode, 0 for none "
+                             f"(default {TRAINING_RENDER_EVERY})")
+    parser.add_argument('--stress', metavar='N', type=int,
+                        help="stress test with N enemies kept alive, report timings and exit")
+    add_stress_arguments(parser, 'stress-')
+    args = parser.parse_args()
+    
+    if args.replay:
+        replay_file(args.replay)
+        return
+    
+    if args.stress:
+        run_stress(args.stress, args.stress_bosses, args.stress_ticks, not args.headless,
+                   args.stress_seed, args.stress_cprofile)
+        return
+    
+    agent_options = None
+    if args.mcts:
+        agent_options = {'time_budget': args.mcts_budget / 1000.0, 'num_workers': args.mcts_workers}
+    
+    game = Game(record_path=args.record, agent_options=agent_options, tick_rate=args.tick_rate,
+                render_fps=args.render_fps, max_catch_up=args.max_catch_up,
+                profile=args.profile, trace_path=args.profile_trace, training=args.training,
+                training_speed=args.training_speed, render_every=args.render_every)
     game.run()
 
 if __name__ == "__main__":
@@ -0,0 +1,45 @@
+"""
+EnemyPool slot reuse
+Views held past release() must not touch the enemy that reuses the slot.
+"""
+
+from game.enemy_pool import EnemyPool
+
+
+def test_stale_view_is_inert():
+    """Writes through a released slot's old view leave the new enemy alone"""
+    pool = EnemyPool()
+    old = pool.spawn(100.0, 100.0, 'goblin')
+    pool.release(old.index)
+    new = pool.spawn(200.0, 150.0, 'skeleton')
+    assert new.index == old.index
+
+    hp = new.hp
+    old.x = 0.0
+    old.y = 0.0
+    old.hp = 1.0
+    old.state = 'attack'
+    old.take_damage(1000)
+    old.alive = False
+
+    assert not old.alive
+    assert new.alive
+    assert (new.x, new.y) == (200.0, 150.0)
+    assert new.hp == hp
+    assert new.state == 'idle'
+
+
+def test_stale_view_after_release_many():
+    """release_many() retires views the same way release() does"""
+    pool = EnemyPool()
+    views = [pool.spawn(100.0 + i, 100.0, 'slime') for i in range(3)]
+    pool.release_many(pool.indices())
+    fresh = [pool.spawn(300.0, 300.0, 'goblin') for _ in range(3)]
+    for view in views:
+        view.take_damage(5)
+        view.x = 0.0
+        assert not view.alive
+    for view in fresh:
+        assert view.alive
+        assert view.hp == view.max_hp
+        assert view.x == 300.0